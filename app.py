@@ -9,35 +9,52 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import atexit
-import copy
 import glob
+import hashlib
+import json
 import os
+import re
 import shutil
 import signal
 import sys
+import threading
+import time
+import uuid
 import warnings
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from datetime import time as _time
+from functools import lru_cache
 
 from flask import (
     Flask,
+    Response,
     flash,
     jsonify,
     redirect,
     render_template,
     request,
     session,
+    stream_with_context,
     url_for,
 )
-from google import genai
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSessionInterface
+from markupsafe import Markup
+from sqlalchemy import insert, select
+from sqlalchemy.orm import load_only, raiseload, selectinload
 
 from auth import (
     AuthService,
     admin_required,
+    flush_last_logins,
+    load_request_auth,
     login_required,
     officer_or_admin_required,
     user_required,
 )
-from blockchain import PropertyBlockchain
+from blockchain import BlockchainHandle, PropertyBlockchain
 from chatbot_service import ChatbotService
 from cid_manager import cid_manager
 from config import Config
@@ -55,20 +72,68 @@ from models import (
 app = Flask(__name__)
 app.config.from_object(Config)
 
+# Keep sessions in Redis when configured - the cookie then only carries the
+# session id. Falls back to Flask's signed cookie sessions otherwise.
+if app.config["SESSION_REDIS_URL"]:
+    try:
+        import redis
+        from flask_session import Session
+
+        app.config["SESSION_TYPE"] = "redis"
+        app.config["SESSION_REDIS"] = redis.Redis.from_url(app.config["SESSION_REDIS_URL"])
+        app.config["SESSION_KEY_PREFIX"] = "pawperties:session:"
+        Session(app)
+        print("✓ Server-side sessions stored in Redis")
+    except ImportError:
+        print("⚠ SESSION_REDIS_URL set but Flask-Session/redis not installed - using cookie sessions")
+
+
+class OrjsonTaggedJSONSerializer(TaggedJSONSerializer):
+    """Flask's tagged session format, (de)serialized with orjson"""
+
+    def dumps(self, value):
+        return orjson.dumps(self.tag(value), option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, value):
+        return self._untag_walk(orjson.loads(value))
+
+    def _untag_walk(self, value):
+        """Untag nested values bottom-up - local so only Flask's public untag() is relied on"""
+        if isinstance(value, dict):
+            return self.untag({k: self._untag_walk(v) for k, v in value.items()})
+        if isinstance(value, list):
+            return [self._untag_walk(item) for item in value]
+        return value
+
+
+# Cookie sessions are decoded and re-signed on every request - use orjson for
+# that when it is installed. The format is unchanged, so existing cookies stay valid.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+if orjson is not None and isinstance(app.session_interface, SecureCookieSessionInterface):
+    app.session_interface.serializer = OrjsonTaggedJSONSerializer()
+
 # Initialize database
 init_db(app)
 
-# Initialize blockchain (singleton instance with auto-save after operations and auto-restore)
-blockchain = PropertyBlockchain(verbose=False, auto_restore=True)
+# Initialize blockchain (singleton instance with auto-save after operations and auto-restore).
+# The handle lets restores swap the instance without rebinding this global.
+blockchain = BlockchainHandle(PropertyBlockchain(verbose=False, auto_restore=True))
 print(f"✓ Blockchain initialized with {len(blockchain.chain)} blocks")
 
 # Restore from database if blockchain only has genesis block
 with app.app_context():
     if len(blockchain.chain) == 1:  # Only genesis block
         try:
-            latest_backup = BlockchainBackup.query.order_by(
-                BlockchainBackup.created_at.desc()
-            ).first()
+            latest_backup = (
+                BlockchainBackup.query.options(
+                    load_only(BlockchainBackup.name, BlockchainBackup.backup_data)
+                )
+                .order_by(BlockchainBackup.created_at.desc())
+                .first()
+            )
             if latest_backup:
                 blockchain.load_from_encrypted_data(latest_backup.backup_data)
                 print(f"✓ Blockchain restored from database: {latest_backup.name}")
@@ -78,30 +143,190 @@ with app.app_context():
         except Exception as e:
             print(f"⚠ Could not restore from database: {str(e)}")
 
-# Initialize Gemini AI
-gemini_client = None
-try:
-    if (
-        app.config["GEMINI_API_KEY"]
-        and app.config["GEMINI_API_KEY"] != "YOUR_API_KEY_HERE"
-    ):
-        gemini_client = genai.Client(api_key=app.config["GEMINI_API_KEY"])
-        print("✓ Gemini AI connected")
-    else:
-        gemini_client = None
-        print("⚠ Using offline chatbot mode (no API key)")
-except Exception as e:
-    gemini_client = None
-    print("⚠ Using offline chatbot mode")
+# Initialize Gemini AI - the client is created on the first chatbot question,
+# not at startup (most requests never touch the chatbot)
+GEMINI_ENABLED = bool(
+    app.config["GEMINI_API_KEY"]
+    and app.config["GEMINI_API_KEY"] != "YOUR_API_KEY_HERE"
+)
+_gemini_client = None
+_gemini_client_lock = threading.Lock()
+
+if GEMINI_ENABLED:
+    print("✓ Gemini AI enabled (client created on first use)")
+else:
+    print("⚠ Using offline chatbot mode (no API key)")
+
+
+def get_gemini_client():
+    """Shared Gemini client, or None in offline mode"""
+    global _gemini_client, GEMINI_ENABLED
+    if _gemini_client is None and GEMINI_ENABLED:
+        with _gemini_client_lock:
+            if _gemini_client is None and GEMINI_ENABLED:
+                try:
+                    # Imported lazily - the SDK is heavy and unused in offline mode
+                    from google import genai
+
+                    _gemini_client = genai.Client(api_key=app.config["GEMINI_API_KEY"])
+                    print("✓ Gemini AI connected")
+                except Exception:
+                    GEMINI_ENABLED = False
+                    print("⚠ Using offline chatbot mode")
+    return _gemini_client
+
 
 # Initialize Chatbot Service
-chatbot_service = ChatbotService(blockchain, gemini_client)
+chatbot_service = ChatbotService(blockchain, gemini_client_factory=get_gemini_client)
+
+
+@app.before_request
+def sync_blockchain():
+    """Pick up a blockchain file that another worker saved or restored"""
+    if request.endpoint != "static":
+        blockchain.get()
+
+
+app.before_request(load_request_auth)
 
 
 # ============================================================================
 # AUTO BACKUP ON SHUTDOWN
 # ============================================================================
 
+# Background pool for IPFS uploads. Uploads take seconds, so request handlers and
+# the shutdown hook only do the fast local write and hand the upload off here.
+# Two workers matches the number of concurrent Pinata connections we use.
+ipfs_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ipfs-upload")
+IPFS_UPLOAD_RETRIES = 3
+
+# Separate single worker for admin database backups so a slow Pinata upload
+# never holds up a DB write (and vice versa)
+db_backup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-backup")
+
+# Status of admin backup jobs, polled by the admin page (newest last, capped).
+# Process-local: polling only finds a task in the worker that started it, so
+# this relies on the single gunicorn worker (gunicorn.conf.py). With more
+# workers, polls landing on another worker get 404 - move this to the
+# database or Redis first.
+admin_tasks = OrderedDict()
+admin_tasks_lock = threading.Lock()
+MAX_ADMIN_TASKS = 50
+
+
+def _write_file_atomic(path, text):
+    """Write text to path via a synced temp file + rename so a crash never leaves a torn file"""
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    # Encode once and hand the whole buffer to a single write
+    with open(tmp_path, "wb", buffering=1 << 20) as f:
+        f.write(text.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _persist_local(encrypted_data, display_name, filename, created_by=1):
+    """Save encrypted blockchain data to the database and the local file (synchronous)"""
+    backup = BlockchainBackup(
+        name=display_name,
+        filename=filename,
+        backup_data=encrypted_data,
+        created_by=created_by,
+    )
+
+    # Save to file first - the IPFS upload reads from it
+    os.makedirs("blocks", exist_ok=True)
+    _write_file_atomic("blocks/blockchain_data.encrypted", encrypted_data)
+    print(f"✅ File backup saved to blocks/blockchain_data.encrypted")
+
+    db.session.add(backup)
+    db.session.commit()
+    print(f"✅ Database backup completed: {display_name}")
+
+    # Clean up old backups (keep only last 10)
+    cleanup_old_backups()
+
+
+def _upload_ipfs(metadata=None):
+    """Upload the local blockchain file to IPFS and save its CID (runs in ipfs_executor)"""
+    if not (blockchain.PINATA_API_KEY and blockchain.PINATA_SECRET_KEY):
+        print("⚠️ IPFS backup skipped (API keys not configured)")
+        return None
+
+    print("\n🌐 Backing up blockchain to IPFS...")
+    ipfs_cid = None
+    for attempt in range(IPFS_UPLOAD_RETRIES):
+        ipfs_cid = blockchain.push_ipfs()
+        if ipfs_cid:
+            break
+        if attempt < IPFS_UPLOAD_RETRIES - 1:
+            # Exponential backoff between attempts: 1s, 2s, ...
+            time.sleep(2**attempt)
+
+    if not ipfs_cid:
+        print("⚠️ IPFS backup failed after retries (check Pinata keys or network)")
+        return None
+
+    print(f"✅ IPFS backup completed!")
+    print(f"   CID: {ipfs_cid}")
+    print(f"   View at: https://gateway.pinata.cloud/ipfs/{ipfs_cid}")
+
+    # Save IPFS CID using CID manager for auto-restore on restart
+    metadata = dict(metadata or {})
+    metadata.update(
+        {
+            "blocks_count": len(blockchain.chain),
+            "file_size": os.path.getsize(blockchain.STORAGE_FILE)
+            if os.path.exists(blockchain.STORAGE_FILE)
+            else 0,
+            "timestamp": datetime.now().isoformat(),
+        }
+    )
+
+    if cid_manager.save_cid(ipfs_cid, metadata):
+        print(f"✅ IPFS CID saved for automatic restoration")
+    else:
+        print(f"⚠️ Could not save IPFS CID via CID manager")
+    return ipfs_cid
+
+
+def submit_admin_task(executor, name, job, *args):
+    """
+    Run an admin job in the background and return its task id.
+    The job returns (success, [(category, message), ...]) - the same
+    messages the route used to flash inline.
+    """
+    task_id = uuid.uuid4().hex
+    task = {"id": task_id, "name": name, "state": "PENDING", "messages": []}
+    with admin_tasks_lock:
+        admin_tasks[task_id] = task
+        while len(admin_tasks) > MAX_ADMIN_TASKS:
+            admin_tasks.popitem(last=False)
+
+    def run():
+        task["state"] = "STARTED"
+        try:
+            with app.app_context():
+                success, messages = job(*args)
+            task["messages"] = messages
+            task["state"] = "SUCCESS" if success else "FAILURE"
+        except Exception as e:
+            task["messages"] = [("danger", f"❌ {name} failed: {str(e)}")]
+            task["state"] = "FAILURE"
+
+    executor.submit(run)
+    return task_id
+
+
+def schedule_ipfs_upload(source):
+    """Queue an IPFS upload of the current blockchain file without blocking the caller"""
+    try:
+        return ipfs_executor.submit(_upload_ipfs, {"source": source})
+    except RuntimeError:
+        # Executor already shut down (interpreter exiting) - upload inline instead
+        _upload_ipfs({"source": source})
+        return None
+
 
 def auto_backup_on_shutdown():
     """Automatically backup blockchain to database and IPFS when server shuts down"""
@@ -120,6 +345,8 @@ def auto_backup_on_shutdown():
 
         # Use app context for database operations
         with app.app_context():
+            flush_last_logins()
+
             # Get encrypted blockchain data
             encrypted_data = blockchain.get_encrypted_data()
 
@@ -128,52 +355,8 @@ def auto_backup_on_shutdown():
             display_name = f"Auto-backup - {timestamp.strftime('%d/%m/%Y %H:%M:%S')}"
             filename = f"auto_backup_{timestamp.strftime('%Y%m%d_%H%M%S')}.encrypted"
 
-            backup = BlockchainBackup(
-                name=display_name,
-                filename=filename,
-                backup_data=encrypted_data,
-                created_by=1,  # System user (admin)
-            )
-
-            db.session.add(backup)
-            db.session.commit()
-            print(f"✅ Database backup completed: {display_name}")
-
-            # Clean up old backups (keep only last 10)
-            cleanup_old_backups()
-
-            # Save to file for IPFS backup
-            os.makedirs("blocks", exist_ok=True)
-            with open("blocks/blockchain_data.encrypted", "w") as f:
-                f.write(encrypted_data)
-            print(f"✅ File backup saved to blocks/blockchain_data.encrypted")
-
-            # Backup to IPFS and save CID using CID manager
-            print("\n🌐 Backing up blockchain to IPFS...")
-            ipfs_cid = blockchain.backup_to_ipfs()
-            if ipfs_cid:
-                print(f"✅ IPFS backup completed!")
-                print(f"   CID: {ipfs_cid}")
-                print(f"   View at: https://gateway.pinata.cloud/ipfs/{ipfs_cid}")
-
-                # Save IPFS CID using CID manager for auto-restore on restart
-                metadata = {
-                    "blocks_count": len(blockchain.chain),
-                    "file_size": os.path.getsize("blocks/blockchain_data.encrypted")
-                    if os.path.exists("blocks/blockchain_data.encrypted")
-                    else 0,
-                    "timestamp": datetime.now().isoformat(),
-                    "source": "auto_backup_on_shutdown",
-                }
-
-                if cid_manager.save_cid(ipfs_cid, metadata):
-                    print(f"✅ IPFS CID saved for automatic restoration")
-                else:
-                    print(f"⚠️ Could not save IPFS CID via CID manager")
-            else:
-                print(
-                    "⚠️ IPFS backup skipped (API keys not configured or error occurred)"
-                )
+            _persist_local(encrypted_data, display_name, filename)
+            schedule_ipfs_upload("auto_backup_on_shutdown")
 
     except Exception as e:
         sys.stderr = original_stderr
@@ -186,25 +369,31 @@ def auto_backup_on_shutdown():
     finally:
         # Always restore stderr
         sys.stderr = original_stderr
+        # Drain queued uploads (including any still running from recent requests)
+        db_backup_executor.shutdown(wait=True)
+        ipfs_executor.shutdown(wait=True)
 
 
 def cleanup_old_backups():
     """Keep only the last 10 backups in database"""
     try:
-        # Get all backups ordered by creation date (newest first)
-        all_backups = BlockchainBackup.query.order_by(
-            BlockchainBackup.created_at.desc()
-        ).all()
-
-        if len(all_backups) > 10:
-            # Keep first 10, delete the rest
-            backups_to_delete = all_backups[10:]
-
-            for backup in backups_to_delete:
-                db.session.delete(backup)
+        # IDs of everything past the newest 10 (never loads the backup_data blobs)
+        ids_to_delete = [
+            backup_id
+            for (backup_id,) in db.session.query(BlockchainBackup.id)
+            .order_by(BlockchainBackup.created_at.desc())
+            .offset(10)
+            .all()
+        ]
+
+        if ids_to_delete:
+            # Single DELETE ... WHERE id IN (...)
+            db.session.query(BlockchainBackup).filter(
+                BlockchainBackup.id.in_(ids_to_delete)
+            ).delete(synchronize_session=False)
 
             db.session.commit()
-            print(f"🧹 Cleaned up {len(backups_to_delete)} old backups (kept last 10)")
+            print(f"🧹 Cleaned up {len(ids_to_delete)} old backups (kept last 10)")
 
     except Exception as e:
         print(f"❌ Backup cleanup failed: {str(e)}")
@@ -229,18 +418,81 @@ signal.signal(signal.SIGTERM, signal_handler)  # Render pause/stop sends SIGTERM
 signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C sends SIGINT
 
 
+# ============================================================================
+# QUERY HELPERS
+# ============================================================================
+
+
+def strict_options(*options):
+    """
+    Loader options for a query, plus raiseload('*') in debug mode so any
+    relationship the query didn't load up front raises instead of silently
+    issuing an extra SELECT (N+1). No effect in production.
+    """
+    if app.debug:
+        return [*options, raiseload("*")]
+    return list(options)
+
+
+# ============================================================================
+# CACHED BLOCKCHAIN VIEWS
+# ============================================================================
+
+# The chain only changes on writes. Keying the caches on blockchain._version
+# makes every mutation (or restore) a cache miss.
+
+
+@lru_cache(maxsize=4)
+def _cached_chain_info(version):
+    """Blockchain statistics for a chain version"""
+    return blockchain.get_chain_info()
+
+
+@lru_cache(maxsize=32)
+def _cached_blocks_html(version, page, per_page):
+    """
+    Rendered block list for one page of the admin chain view. Only this
+    fragment is cached - the surrounding page carries flash messages and
+    the logged-in user, so it is rendered per request.
+    """
+    start = (page - 1) * per_page
+    blocks = [block.to_dict() for block in blockchain.chain[start : start + per_page]]
+    return Markup(render_template("view_blockchain_blocks.html", blockchain=blocks))
+
+
+@lru_cache(maxsize=4)
+def _cached_validation(version):
+    """validate_with_details() result for a chain version (full SHA-256 walk)"""
+    return blockchain.validate_with_details()
+
+
+@lru_cache(maxsize=256)
+def _cached_search(version, query):
+    """
+    unified_search() results for a chain version. The query arrives
+    stripped and lower-cased (unified_search ignores case anyway), so
+    repeats that differ only in case share an entry.
+    """
+    return blockchain.unified_search(query)
+
+
 # ============================================================================
 # JINJA2 FILTERS
 # ============================================================================
 
 
+# Strips spaces and dashes in a single pass
+_STRIP_TABLE = str.maketrans("", "", " -")
+
+
 @app.template_filter("mask_aadhar")
+@lru_cache(maxsize=4096)
 def mask_aadhar_filter(aadhar):
     """Mask Aadhar number showing only last 4 digits (e.g., XXXX-XXXX-1234)"""
     if not aadhar:
         return "N/A"
     # Remove any existing formatting
-    aadhar_clean = str(aadhar).replace(" ", "").replace("-", "")
+    aadhar_clean = str(aadhar).translate(_STRIP_TABLE)
     if len(aadhar_clean) != 12:
         return aadhar  # Return as-is if invalid format
     # Mask first 8 digits, show last 4
@@ -248,12 +500,16 @@ def mask_aadhar_filter(aadhar):
 
 
 @app.template_filter("mask_pan")
+@lru_cache(maxsize=4096)
 def mask_pan_filter(pan):
     """Mask PAN number showing only last 4 characters (e.g., XXXXX1234X)"""
     if not pan:
         return "N/A"
     # Remove any existing formatting
-    pan_clean = str(pan).replace(" ", "").replace("-", "").upper()
+    pan_clean = str(pan).translate(_STRIP_TABLE)
+    # Stored PANs are already uppercase; skip the extra copy in that case
+    if not pan_clean.isupper():
+        pan_clean = pan_clean.upper()
     if len(pan_clean) != 10:
         return pan  # Return as-is if invalid format
     # Mask first 6 characters, show last 4
@@ -271,8 +527,8 @@ def index():
     if not AuthService.is_authenticated():
         return redirect(url_for("login"))
 
-    user = AuthService.get_current_user()
-    if user["role"] == "user":
+    # Role bit is resolved per request - no need to build the full user dict
+    if AuthService.is_user():
         return redirect(url_for("user_dashboard"))
     else:
         return redirect(url_for("dashboard"))
@@ -282,8 +538,7 @@ def index():
 def login():
     """User login page with role-based redirection"""
     if AuthService.is_authenticated():
-        user_role = session.get("role")
-        if user_role == "user":
+        if AuthService.is_user():
             return redirect(url_for("user_dashboard"))
         return redirect(url_for("dashboard"))
 
@@ -337,26 +592,36 @@ def register():
             )
 
             if matching_properties:
-                for prop_data in matching_properties:
-                    # Check if property already linked
-                    if not Property.query.filter_by(
-                        property_key=prop_data["property_key"]
-                    ).first():
-                        new_property = Property(
-                            property_key=prop_data["property_key"],
-                            user_id=new_user.id,
-                            address=prop_data["address"],
-                            pincode=prop_data["pincode"],
-                            value=prop_data["value"],
-                            survey_no=prop_data["survey_no"],
-                        )
-                        db.session.add(new_property)
-                db.session.commit()
+                # Find already-linked properties with a single IN (...) query
+                property_keys = [p["property_key"] for p in matching_properties]
+                linked_keys = {
+                    key
+                    for (key,) in db.session.query(Property.property_key).filter(
+                        Property.property_key.in_(property_keys)
+                    )
+                }
+                # Pure inserts - skip the ORM unit of work and emit one batch
+                rows = [
+                    {
+                        "property_key": prop_data["property_key"],
+                        "user_id": new_user.id,
+                        "address": prop_data["address"],
+                        "pincode": prop_data["pincode"],
+                        "value": prop_data["value"],
+                        "survey_no": prop_data["survey_no"],
+                    }
+                    for prop_data in matching_properties
+                    if prop_data["property_key"] not in linked_keys
+                ]
+                if rows:
+                    db.session.bulk_insert_mappings(Property, rows)
                 flash(
                     f"{len(matching_properties)} properties linked to your account.",
                     "info",
                 )
 
+            # One commit for the new user and its property links
+            db.session.commit()
             flash(message, "success")
             return redirect(url_for("login"))
         else:
@@ -391,22 +656,39 @@ def manage_appointments():
     current_date = current_datetime.date()
     current_time = current_datetime.time()
     
-    # Find all confirmed appointments that have passed their scheduled date/time
-    confirmed_appointments = Appointment.query.filter_by(status="confirmed").all()
-    
-    for appt in confirmed_appointments:
+    # Find confirmed appointments that have passed their scheduled date/time
+    # (only the columns needed for the check, and nothing scheduled after today)
+    confirmed_appointments = (
+        db.session.query(
+            Appointment.id, Appointment.preferred_date, Appointment.preferred_time
+        )
+        .filter(
+            Appointment.status == "confirmed",
+            Appointment.preferred_date <= current_date,
+        )
+        .all()
+    )
+
+    expired_ids = [
+        appt_id
+        for appt_id, preferred_date, preferred_time in confirmed_appointments
         # Combine preferred_date and preferred_time for comparison
-        appointment_datetime = datetime.combine(appt.preferred_date, appt.preferred_time)
-        
-        # If appointment datetime has passed, mark as closed
-        if appointment_datetime < current_datetime:
-            appt.status = "closed"
-    
-    # Commit any status changes
-    db.session.commit()
+        if datetime.combine(preferred_date, preferred_time) < current_datetime
+    ]
+
+    # Mark them all closed with one UPDATE
+    if expired_ids:
+        Appointment.query.filter(Appointment.id.in_(expired_ids)).update(
+            {"status": "closed"}, synchronize_session=False
+        )
+        db.session.commit()
     
     # Fetch all appointments
-    all_appointments = Appointment.query.order_by(Appointment.created_at.desc()).all()
+    all_appointments = (
+        Appointment.query.options(*strict_options())
+        .order_by(Appointment.created_at.desc())
+        .all()
+    )
     
     # Separate into active and past appointments
     active_appointments = [appt for appt in all_appointments if appt.status in ["pending", "confirmed"]]
@@ -460,28 +742,143 @@ def view_chat(appointment_id):
     return render_template("chat.html", appointment=appointment)
 
 
-@app.route("/chat/<int:appointment_id>/messages")
-@login_required
-def get_messages(appointment_id):
-    messages = (
-        Message.query.filter_by(appointment_id=appointment_id)
-        .order_by(Message.timestamp.asc())
+# Open chat streams per appointment: appointment_id -> _ChatChannel.
+# send_message bumps the channel's sequence number and wakes its waiters;
+# the entry is dropped as soon as nobody is waiting on it.
+_chat_channels = {}
+_chat_channels_lock = threading.Lock()
+
+# A stream is a long-poll: it waits at most CHAT_STREAM_WAIT seconds for a
+# new message, sends what it has and ends, and EventSource reconnects after
+# CHAT_STREAM_RETRY_MS (resuming from Last-Event-ID). Streams still hold a
+# gthread thread while they wait, so at most half of the worker's threads
+# may be streaming; beyond that the stream gets a 503 and the page polls.
+CHAT_STREAM_WAIT = 10
+CHAT_STREAM_RETRY_MS = 1000
+CHAT_STREAM_MAX_CONCURRENT = max(1, int(os.environ.get("GUNICORN_THREADS", 8)) // 2)
+_chat_stream_slots = threading.BoundedSemaphore(CHAT_STREAM_MAX_CONCURRENT)
+
+
+class _ChatChannel:
+    """Wake-up point for the streams of one appointment"""
+
+    __slots__ = ("condition", "sequence", "waiters")
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.waiters = 0
+
+
+def _chat_subscribe(appointment_id):
+    with _chat_channels_lock:
+        channel = _chat_channels.get(appointment_id)
+        if channel is None:
+            channel = _chat_channels[appointment_id] = _ChatChannel()
+        channel.waiters += 1
+        return channel
+
+
+def _chat_unsubscribe(appointment_id, channel):
+    with _chat_channels_lock:
+        channel.waiters -= 1
+        if not channel.waiters and _chat_channels.get(appointment_id) is channel:
+            del _chat_channels[appointment_id]
+
+
+def _chat_notify(appointment_id):
+    with _chat_channels_lock:
+        channel = _chat_channels.get(appointment_id)
+    if channel is not None:
+        with channel.condition:
+            channel.sequence += 1
+            channel.condition.notify_all()
+
+
+def _fetch_messages(appointment_id, after_id=0):
+    """Messages of an appointment newer than after_id, serialized for JSON."""
+    # Single joined query for the columns we serialize (avoids a sender lookup per message)
+    rows = (
+        db.session.query(
+            Message.id,
+            Message.sender_id,
+            User.full_name,
+            Message.content,
+            Message.timestamp,
+        )
+        .join(User, Message.sender_id == User.id)
+        .filter(Message.appointment_id == appointment_id, Message.id > after_id)
+        .order_by(Message.timestamp.asc(), Message.id.asc())
         .all()
     )
-    return jsonify(
+    return [
         {
-            "messages": [
-                {
-                    "id": msg.id,
-                    "sender_id": msg.sender_id,
-                    "sender_name": msg.sender.full_name,
-                    "content": msg.content,
-                    "timestamp": msg.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                }
-                for msg in messages
-            ]
+            "id": msg_id,
+            "sender_id": sender_id,
+            "sender_name": sender_name,
+            "content": content,
+            "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
         }
+        for msg_id, sender_id, sender_name, content, timestamp in rows
+    ]
+
+
+@app.route("/chat/<int:appointment_id>/messages")
+@login_required
+def get_messages(appointment_id):
+    return jsonify({"messages": _fetch_messages(appointment_id)})
+
+
+@app.route("/chat/<int:appointment_id>/stream")
+@login_required
+def stream_messages(appointment_id):
+    """Server-sent events: push new chat messages instead of having the page poll"""
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_id", 0)
+    try:
+        last_id = int(last_id)
+    except (TypeError, ValueError):
+        last_id = 0
+
+    if not _chat_stream_slots.acquire(blocking=False):
+        return Response(
+            "Too many open chat streams", status=503, headers={"Retry-After": "30"}
+        )
+
+    def generate(last_id):
+        channel = _chat_subscribe(appointment_id)
+        try:
+            # Read the sequence before querying, so a message committed
+            # between the query and the wait still wakes us
+            with channel.condition:
+                seen = channel.sequence
+            messages = _fetch_messages(appointment_id, last_id)
+            db.session.close()
+            if not messages:
+                with channel.condition:
+                    notified = channel.condition.wait_for(
+                        lambda: channel.sequence != seen, timeout=CHAT_STREAM_WAIT
+                    )
+                if notified:
+                    messages = _fetch_messages(appointment_id, last_id)
+                    # Give the connection back to the pool before streaming
+                    db.session.close()
+        finally:
+            _chat_unsubscribe(appointment_id, channel)
+
+        yield f"retry: {CHAT_STREAM_RETRY_MS}\n\n"
+        for msg in messages:
+            yield f"id: {msg['id']}\ndata: {json.dumps(msg)}\n\n"
+        if not messages:
+            yield ": keep-alive\n\n"
+
+    response = Response(
+        stream_with_context(generate(last_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+    # Runs however the response ends, even if the generator never started
+    response.call_on_close(_chat_stream_slots.release)
+    return response
 
 
 @app.route("/chat/<int:appointment_id>/send", methods=["POST"])
@@ -496,6 +893,8 @@ def send_message(appointment_id):
     )
     db.session.add(new_message)
     db.session.commit()
+
+    _chat_notify(appointment_id)
     return jsonify({"status": "success"})
 
 
@@ -504,12 +903,8 @@ def send_message(appointment_id):
 def dashboard():
     """Admin and Officer dashboard"""
     user = AuthService.get_current_user()
-    blockchain_info = blockchain.get_chain_info()
-
-    all_properties = blockchain.get_all_properties()
-    recent_properties = sorted(
-        all_properties, key=lambda x: x.get("last_updated", ""), reverse=True
-    )[:5]
+    blockchain_info = _cached_chain_info(blockchain._version)
+    recent_properties = blockchain.get_properties_page(0, 5)
 
     return render_template(
         "dashboard.html",
@@ -523,6 +918,27 @@ def dashboard():
 # PROPERTY OPERATIONS
 # ============================================================================
 
+# Form fields accepted by add_property (same names as PropertyBlockchain.add_property)
+_ADD_PROPERTY_FIELDS = (
+    "property_key",
+    "owner",
+    "address",
+    "pincode",
+    "value",
+    "aadhar_no",
+    "pan_no",
+    "survey_no",
+    "rtc_no",
+    "village",
+    "taluk",
+    "district",
+    "state",
+    "land_area",
+    "land_type",
+    "description",
+)
+_ADD_PROPERTY_REQUIRED = frozenset(_ADD_PROPERTY_FIELDS[:8])
+
 
 @app.route("/property/add", methods=["GET", "POST"])
 @officer_or_admin_required
@@ -531,61 +947,34 @@ def add_property():
     user = AuthService.get_current_user()
 
     if request.method == "POST":
-        # Extract all form fields
-        property_key = request.form.get("property_key", "").strip()
-        owner = request.form.get("owner", "").strip()
-        address = request.form.get("address", "").strip()
-        pincode = request.form.get("pincode", "").strip()
-        value = request.form.get("value", "").strip()
-        aadhar_no = request.form.get("aadhar_no", "").strip()
-        pan_no = request.form.get("pan_no", "").strip()
-        survey_no = request.form.get("survey_no", "").strip()
-        rtc_no = request.form.get("rtc_no", "").strip()
-        village = request.form.get("village", "").strip()
-        taluk = request.form.get("taluk", "").strip()
-        district = request.form.get("district", "").strip()
-        state = request.form.get("state", "").strip()
-        land_area = request.form.get("land_area", "").strip()
-        land_type = request.form.get("land_type", "").strip()
-        description = request.form.get("description", "").strip()
+        # Extract all form fields in one pass
+        form = request.form
+        vals = {field: form.get(field, "").strip() for field in _ADD_PROPERTY_FIELDS}
 
         # Validation - required fields
-        if not all(
-            [property_key, owner, address, pincode, value, aadhar_no, pan_no, survey_no]
-        ):
+        if any(not vals[field] for field in _ADD_PROPERTY_REQUIRED):
             flash("All required fields must be filled.", "danger")
             return render_template("add_property.html", user=user)
 
         # Validate value
         try:
-            value = float(value)
-            if value <= 0:
+            vals["value"] = float(vals["value"])
+            if vals["value"] <= 0:
                 raise ValueError("Property value must be positive")
         except ValueError:
             flash("Invalid property value.", "danger")
             return render_template("add_property.html", user=user)
 
+        property_key = vals["property_key"]
+        aadhar_no = vals["aadhar_no"]
+        pan_no = vals["pan_no"]
+
         # Add to blockchain with Indian standards
         try:
-            block = blockchain.add_property(
-                property_key=property_key,
-                owner=owner,
-                address=address,
-                pincode=pincode,
-                value=value,
-                aadhar_no=aadhar_no,
-                pan_no=pan_no,
-                survey_no=survey_no,
-                rtc_no=rtc_no,
-                village=village,
-                taluk=taluk,
-                district=district,
-                state=state,
-                land_area=land_area,
-                land_type=land_type,
-                description=description,
-            )
-            blockchain.save_and_exit()
+            block = blockchain.add_property(**vals)
+            # Persist locally now; the IPFS upload runs in the background
+            blockchain.save_local()
+            schedule_ipfs_upload("add_property")
             
             # Sync to database: Find user by Aadhar or PAN and link property
             property_owner = User.query.filter(
@@ -603,10 +992,10 @@ def add_property():
                     new_property = Property(
                         property_key=property_key,
                         user_id=property_owner.id,
-                        address=address,
-                        pincode=pincode,
-                        value=value,
-                        survey_no=survey_no,
+                        address=vals["address"],
+                        pincode=vals["pincode"],
+                        value=vals["value"],
+                        survey_no=vals["survey_no"],
                     )
                     db.session.add(new_property)
                     db.session.commit()
@@ -670,7 +1059,9 @@ def transfer_property():
                 stamp_duty_paid=stamp_duty_paid,
                 registration_fee=registration_fee,
             )
-            blockchain.save_and_exit()
+            # Persist locally now; the IPFS upload runs in the background
+            blockchain.save_local()
+            schedule_ipfs_upload("transfer_property")
             
             # Sync to database: Update property ownership
             new_owner_user = User.query.filter(
@@ -761,7 +1152,9 @@ def inherit_property():
                 relationship=relationship,
                 legal_heir_certificate_no=legal_heir_certificate_no,
             )
-            blockchain.save_and_exit()
+            # Persist locally now; the IPFS upload runs in the background
+            blockchain.save_local()
+            schedule_ipfs_upload("inherit_property")
             
             # Sync to database: Update property ownership to heir
             heir_user = User.query.filter(
@@ -846,17 +1239,16 @@ def property_history(property_key):
         return redirect(url_for("dashboard"))
 
     # Process history to remove/mask sensitive data
-    # IMPORTANT: Use deep copy to avoid mutating the original blockchain data
+    # IMPORTANT: Never mutate the original blockchain data. Only the top-level
+    # block dict and its "data" dict are modified, so those are the only copies made.
     processed_history = []
     for block in history:
-        # Create a deep copy to ensure we never mutate the original blockchain
-        block_copy = copy.deepcopy(block)
-
-        # 1. Remove hash information
-        block_copy.pop("hash", None)
-        block_copy.pop("previous_hash", None)
-
-        data = block_copy.get("data", {})
+        # 1. Drop hash information while copying the block
+        block_copy = {
+            k: v for k, v in block.items() if k not in ("hash", "previous_hash")
+        }
+        data = dict(block_copy.get("data", {}))
+        block_copy["data"] = data
 
         # 2. Mask Aadhaar numbers that do not belong to the current owner
         if data.get("type") == "registration":
@@ -898,7 +1290,7 @@ def search_owner():
     if request.method == "POST":
         search_query = request.form.get("query", "").strip()
         if search_query:
-            properties = blockchain.unified_search(search_query)
+            properties = _cached_search(blockchain._version, search_query.lower())
 
     return render_template(
         "search_owner.html", user=user, properties=properties, search_query=search_query
@@ -918,13 +1310,23 @@ def comprehensive_search():
 def all_properties():
     """View all properties in the system (for admins and officers)"""
     user = AuthService.get_current_user()
-    properties = blockchain.get_all_properties()
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 100, type=int), 1), 500)
 
-    properties = sorted(
-        properties, key=lambda x: x.get("last_updated", ""), reverse=True
-    )
+    # Properties are kept sorted by last update, so only the requested page is built
+    total_properties = blockchain.get_property_count()
+    properties = blockchain.get_properties_page((page - 1) * per_page, per_page)
+    total_pages = max((total_properties + per_page - 1) // per_page, 1)
 
-    return render_template("all_properties.html", user=user, properties=properties)
+    return render_template(
+        "all_properties.html",
+        user=user,
+        properties=properties,
+        total_properties=total_properties,
+        page=page,
+        per_page=per_page,
+        total_pages=total_pages,
+    )
 
 
 # ============================================================================
@@ -961,18 +1363,16 @@ def chatbot_message():
 def user_dashboard():
     """User dashboard to view owned properties and appointments"""
     user_id = session.get("user_id")
-    user = User.query.get_or_404(user_id)
-    user_properties = Property.query.filter_by(user_id=user.id).all()
-    user_appointments = (
-        Appointment.query.filter_by(user_id=user.id)
-        .order_by(Appointment.created_at.desc())
-        .all()
-    )
+    # Load both collections up front (appointments come ordered newest first
+    # from the relationship) so the template never triggers a lazy load
+    user = User.query.options(
+        *strict_options(selectinload(User.properties), selectinload(User.appointments))
+    ).get_or_404(user_id)
     return render_template(
         "user_dashboard.html",
         user=user,
-        properties=user_properties,
-        appointments=user_appointments,
+        properties=user.properties,
+        appointments=user.appointments,
     )
 
 
@@ -993,6 +1393,12 @@ def user_profile():
     return render_template("user_profile.html", user=user)
 
 
+# Office hours and closed day for appointments
+APPT_OPEN = _time(8, 0)
+APPT_CLOSE = _time(18, 0)
+SUNDAY = 6
+
+
 @app.route(
     "/appointment/schedule/<property_key>/<appointment_type>", methods=["GET", "POST"]
 )
@@ -1012,11 +1418,23 @@ def schedule_appointment(property_key, appointment_type):
         preferred_time_str = request.form.get("preferred_time")
         notes = request.form.get("notes")
 
-        preferred_date = datetime.strptime(preferred_date_str, "%Y-%m-%d").date()
-        preferred_time = datetime.strptime(preferred_time_str, "%H:%M").time()
+        try:
+            preferred_date = date.fromisoformat(preferred_date_str)
+            preferred_time = _time.fromisoformat(preferred_time_str)
+            # fromisoformat accepts "10:00+05:30"; an aware time cannot be
+            # compared with the naive office hours below
+            if preferred_time.tzinfo is not None:
+                raise ValueError("time zone offsets are not accepted")
+        except (TypeError, ValueError):
+            flash("Please choose a valid date and time.", "danger")
+            return render_template(
+                "schedule_appointment.html",
+                property_key=property_key,
+                appointment_type=appointment_type,
+            )
 
         # Server-side validation for date and time
-        if preferred_date.weekday() == 6:  # 6 corresponds to Sunday
+        if preferred_date.weekday() == SUNDAY:
             flash(
                 "Appointments cannot be scheduled on Sundays. Please choose a different day.",
                 "danger",
@@ -1027,11 +1445,7 @@ def schedule_appointment(property_key, appointment_type):
                 appointment_type=appointment_type,
             )
 
-        if not (
-            datetime.strptime("08:00", "%H:%M").time()
-            <= preferred_time
-            <= datetime.strptime("18:00", "%H:%M").time()
-        ):
+        if not (APPT_OPEN <= preferred_time <= APPT_CLOSE):
             flash(
                 "Appointments can only be scheduled between 8:00 AM and 6:00 PM.",
                 "danger",
@@ -1042,18 +1456,20 @@ def schedule_appointment(property_key, appointment_type):
                 appointment_type=appointment_type,
             )
 
-        new_appointment = Appointment(
-            user_id=user_id,
-            property_key=property_key,
-            appointment_type=appointment_type,
-            full_name=full_name,
-            phone_number=phone_number,
-            email=email,
-            preferred_date=preferred_date,
-            preferred_time=preferred_time,
-            notes=notes,
+        # Nothing reads the new row back - a plain INSERT skips the unit of work
+        db.session.execute(
+            insert(Appointment).values(
+                user_id=user_id,
+                property_key=property_key,
+                appointment_type=appointment_type,
+                full_name=full_name,
+                phone_number=phone_number,
+                email=email,
+                preferred_date=preferred_date,
+                preferred_time=preferred_time,
+                notes=notes,
+            )
         )
-        db.session.add(new_appointment)
         db.session.commit()
 
         flash(
@@ -1079,8 +1495,10 @@ def schedule_appointment(property_key, appointment_type):
 def blockchain_admin():
     """Blockchain administration dashboard"""
     user = AuthService.get_current_user()
-    blockchain_info = blockchain.get_chain_info()
-    is_valid, validation_message, validation_logs = blockchain.validate_with_details()
+    blockchain_info = _cached_chain_info(blockchain._version)
+    is_valid, validation_message, validation_logs = _cached_validation(
+        blockchain._version
+    )
 
     return render_template(
         "blockchain_admin.html",
@@ -1089,6 +1507,7 @@ def blockchain_admin():
         is_valid=is_valid,
         validation_message=validation_message,
         validation_logs=validation_logs,
+        task_id=request.args.get("task"),
     )
 
 
@@ -1111,13 +1530,58 @@ def validate_blockchain():
 def view_blockchain():
     """View complete blockchain"""
     user = AuthService.get_current_user()
-    blockchain_data = blockchain.to_dict()
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 50, type=int), 1), 500)
+
+    total_blocks = len(blockchain.chain)
+    total_pages = max((total_blocks + per_page - 1) // per_page, 1)
 
     return render_template(
-        "view_blockchain.html", user=user, blockchain=blockchain_data
+        "view_blockchain.html",
+        user=user,
+        blocks_html=_cached_blocks_html(blockchain._version, page, per_page),
+        total_blocks=total_blocks,
+        page=page,
+        per_page=per_page,
+        total_pages=total_pages,
     )
 
 
+@app.route("/admin/blockchain/export.json")
+@admin_required
+def export_blockchain():
+    """Stream the complete blockchain as a JSON array, one block at a time"""
+    chain = list(blockchain.chain)  # Snapshot - new blocks may be appended meanwhile
+
+    def generate():
+        yield "["
+        for i, block in enumerate(chain):
+            yield ("," if i else "") + json.dumps(block.to_dict())
+        yield "]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+def _db_backup_job(encrypted_data, display_name, filename, created_by):
+    """Write a database backup (runs on db_backup_executor)"""
+    try:
+        db.session.execute(
+            insert(BlockchainBackup).values(
+                name=display_name,
+                filename=filename,
+                backup_data=encrypted_data,
+                created_by=created_by,
+            )
+        )
+        db.session.commit()
+        return True, [
+            ("success", f"✅ Blockchain backup saved to database: {display_name}")
+        ]
+    except Exception as e:
+        db.session.rollback()
+        return False, [("danger", f"❌ Backup failed: {str(e)}")]
+
+
 @app.route("/admin/blockchain/backup", methods=["POST"])
 @admin_required
 def backup_blockchain():
@@ -1125,7 +1589,8 @@ def backup_blockchain():
     user = AuthService.get_current_user()
 
     try:
-        # Get encrypted blockchain data
+        # Snapshot the chain here so the backup matches what the admin saw;
+        # the database write happens in the background
         encrypted_data = blockchain.get_encrypted_data()
 
         # Create backup record
@@ -1133,30 +1598,27 @@ def backup_blockchain():
         display_name = f"Save - {timestamp.strftime('%d/%m/%Y %H:%M:%S')}"
         filename = f"blockchain_backup_{timestamp.strftime('%Y%m%d_%H%M%S')}.encrypted"
 
-        backup = BlockchainBackup(
-            name=display_name,
-            filename=filename,
-            backup_data=encrypted_data,
-            created_by=user["id"],
+        task_id = submit_admin_task(
+            db_backup_executor,
+            "Database backup",
+            _db_backup_job,
+            encrypted_data,
+            display_name,
+            filename,
+            user["id"],
         )
-
-        db.session.add(backup)
-        db.session.commit()
-
-        flash(f"✅ Blockchain backup saved to database: {display_name}", "success")
+        flash(f"⏳ Saving backup to database: {display_name}", "info")
     except Exception as e:
-        db.session.rollback()
         flash(f"❌ Backup failed: {str(e)}", "danger")
+        return redirect(url_for("blockchain_admin"))
 
-    return redirect(url_for("blockchain_admin"))
+    return redirect(url_for("blockchain_admin", task=task_id))
 
 
 @app.route("/admin/blockchain/restore", methods=["POST"])
 @admin_required
 def restore_blockchain():
     """Restore blockchain from database backup"""
-    global blockchain
-
     backup_id_str = request.form.get("backup_file", "").strip()
 
     if not backup_id_str:
@@ -1169,79 +1631,88 @@ def restore_blockchain():
         flash("Invalid backup ID", "danger")
         return redirect(url_for("blockchain_admin"))
 
-    # Get the backup from database
-    backup = BlockchainBackup.query.get(backup_id)
-    if not backup:
+    # Get the backup from database - just the two columns we use, no ORM instance
+    row = db.session.execute(
+        select(BlockchainBackup.name, BlockchainBackup.backup_data).where(
+            BlockchainBackup.id == backup_id
+        )
+    ).first()
+    if row is None:
         flash("Backup not found", "danger")
         return redirect(url_for("blockchain_admin"))
+    backup_name, backup_data = row
 
     try:
-        # Backup current blockchain before restoring
-        current_data = blockchain.get_encrypted_data()
-        pre_restore_backup = BlockchainBackup(
-            name=f"Pre-restore backup - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
-            filename="auto_backup_pre_restore.encrypted",
-            backup_data=current_data,
-            created_by=AuthService.get_current_user()["id"],
-        )
-        db.session.add(pre_restore_backup)
-        db.session.commit()
-        flash(
-            f"Current blockchain backed up to database as: {pre_restore_backup.name}",
-            "info",
-        )
-
-        # Create new blockchain instance and load from backup data
-        new_blockchain = PropertyBlockchain(verbose=True)
-        success = new_blockchain.load_from_encrypted_data(backup.backup_data)
+        # Load the backup into a fresh instance first - decrypting it touches
+        # neither the live chain nor the database
+        new_blockchain = PropertyBlockchain(verbose=True, load_existing=False)
+        success = new_blockchain.load_from_encrypted_data(backup_data)
+        recovery_message = None
+        if not success:
+            # Try recovery as fallback
+            success, recovery_message = (
+                new_blockchain.attempt_recovery_from_encrypted_data(backup_data)
+            )
 
         if success:
-            blockchain = new_blockchain
-            # Save to local storage for persistence
-            blockchain._save_blockchain()
-            flash(
-                f'✅ Blockchain restored from database backup "{backup.name}"! Loaded {len(blockchain.chain)} blocks.',
-                "success",
+            # Backup current blockchain before restoring. A plain INSERT keeps
+            # the snapshot out of the session, and it is committed before the
+            # live chain is swapped so a failed commit leaves nothing restored
+            # without its snapshot.
+            pre_restore_name = (
+                f"Pre-restore backup - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
             )
-        else:
-            # Try recovery as fallback
-            recovery_success, recovery_message = (
-                new_blockchain.attempt_recovery_from_encrypted_data(backup.backup_data)
+            db.session.execute(
+                insert(BlockchainBackup).values(
+                    name=pre_restore_name,
+                    filename="auto_backup_pre_restore.encrypted",
+                    backup_data=blockchain.get_encrypted_data(),
+                    created_by=AuthService.get_current_user()["id"],
+                )
+            )
+            db.session.commit()
+            flash(
+                f"Current blockchain backed up to database as: {pre_restore_name}",
+                "info",
             )
 
-            if recovery_success:
-                blockchain = new_blockchain
-                # Save to local storage for persistence
-                blockchain._save_blockchain()
+            # Save to local storage for persistence, then swap the live chain
+            new_blockchain._save_blockchain()
+            blockchain.replace(new_blockchain)
+            if recovery_message is None:
+                flash(
+                    f'✅ Blockchain restored from database backup "{backup_name}"! Loaded {len(blockchain.chain)} blocks.',
+                    "success",
+                )
+            else:
                 flash(f"⚠️ Partial recovery successful: {recovery_message}", "warning")
                 flash(
-                    f'Restored {len(blockchain.chain)} blocks from backup "{backup.name}"',
+                    f'Restored {len(blockchain.chain)} blocks from backup "{backup_name}"',
                     "info",
                 )
+        else:
+            # Provide detailed error information
+            error_details = []
+            if hasattr(new_blockchain, "logs") and new_blockchain.logs:
+                # Show last 5 error logs
+                error_logs = [
+                    log
+                    for log in new_blockchain.recent_logs(10)
+                    if "error" in log.lower()
+                    or "failed" in log.lower()
+                    or "invalid" in log.lower()
+                ]
+                if error_logs:
+                    error_details = error_logs[-5:]  # Last 5 relevant logs
+
+            error_msg = "❌ Blockchain restore failed! Backup data is corrupted."
+            if error_details:
+                error_msg += " Details: " + " | ".join(error_details)
             else:
-                # Provide detailed error information
-                error_details = []
-                if hasattr(new_blockchain, "logs") and new_blockchain.logs:
-                    # Show last 5 error logs
-                    error_logs = [
-                        log
-                        for log in new_blockchain.logs[-10:]
-                        if "error" in log.lower()
-                        or "failed" in log.lower()
-                        or "invalid" in log.lower()
-                    ]
-                    if error_logs:
-                        error_details = error_logs[-5:]  # Last 5 relevant logs
-
-                error_msg = "❌ Blockchain restore failed! Backup data is corrupted."
-                if error_details:
-                    error_msg += " Details: " + " | ".join(error_details)
-                else:
-                    error_msg += (
-                        " The backup data appears to be corrupted or incompatible."
-                    )
+                error_msg += " The backup data appears to be corrupted or incompatible."
 
-                flash(error_msg, "danger")
+            # Current chain is untouched and no snapshot was written
+            flash(error_msg, "danger")
 
     except Exception as e:
         db.session.rollback()
@@ -1254,29 +1725,31 @@ def restore_blockchain():
 @admin_required
 def list_backups():
     """Get list of available database backups as JSON with friendly names"""
-    backups = BlockchainBackup.query.order_by(BlockchainBackup.created_at.desc()).all()
+    # Only id and name are listed - select just those columns, never the blobs
+    rows = (
+        db.session.query(BlockchainBackup.id, BlockchainBackup.name)
+        .order_by(BlockchainBackup.created_at.desc())
+        .all()
+    )
 
-    backup_list = []
-    for i, backup in enumerate(backups, 1):
-        backup_list.append(
-            {
-                "id": backup.id,
-                "path": f"db_backup_{backup.id}",  # Use ID for restore
-                "name": backup.name,
-            }
-        )
+    backup_list = [
+        {
+            "id": backup_id,
+            "path": f"db_backup_{backup_id}",  # Use ID for restore
+            "name": name,
+        }
+        for backup_id, name in rows
+    ]
 
     return jsonify({"backups": backup_list})
 
 
-@app.route("/admin/backup-ipfs", methods=["POST"])
-@admin_required
-def backup_to_ipfs():
-    """Backup blockchain to IPFS (Admin only)"""
-    # Clear logs before backup
-    blockchain.logs = []
-
-    cid = blockchain.backup_to_ipfs()
+def _ipfs_backup_job(user_id):
+    """Upload the blockchain to IPFS and save its CID (runs on ipfs_executor)"""
+    # Keep this job's own messages - blockchain.logs is shared with request threads
+    with PropertyBlockchain.capture_logs() as backup_logs:
+        cid = blockchain.backup_to_ipfs()
+    messages = []
 
     if cid:
         # Save IPFS CID using CID manager for auto-restore
@@ -1285,55 +1758,79 @@ def backup_to_ipfs():
             "file_size": os.path.getsize(blockchain.STORAGE_FILE)
             if os.path.exists(blockchain.STORAGE_FILE)
             else 0,
-            "created_by": session.get("user_id", 1),  # Current user or system
+            "created_by": user_id,
             "timestamp": datetime.now().isoformat(),
             "source": "manual_backup",
         }
 
+        messages.append(("success", f"✅ Backup successful! IPFS CID: {cid}"))
         if cid_manager.save_cid(cid, metadata):
-            flash(f"✅ Backup successful! IPFS CID: {cid}", "success")
-            flash(f"View at: https://gateway.pinata.cloud/ipfs/{cid}", "info")
-            flash(
-                f"✅ CID saved for automatic restoration on server restart",
-                "success",
+            messages.append(("info", f"View at: https://gateway.pinata.cloud/ipfs/{cid}"))
+            messages.append(
+                ("success", f"✅ CID saved for automatic restoration on server restart")
             )
         else:
-            flash(f"✅ Backup successful! IPFS CID: {cid}", "success")
-            flash(f"⚠️ Could not save CID for auto-restore", "warning")
-    else:
-        flash("❌ Backup failed. Check the details below.", "danger")
-        # Show logs from the backup attempt
-        if hasattr(blockchain, "logs") and blockchain.logs:
-            for log in blockchain.logs[-10:]:
-                if "error" in str(log).lower():
-                    flash(f"❌ {log}", "danger")
-                else:
-                    flash(f"ℹ️ {log}", "info")
+            messages.append(("warning", f"⚠️ Could not save CID for auto-restore"))
+        return True, messages
+
+    messages.append(("danger", "❌ Backup failed. Check the details below."))
+    # Show logs from the backup attempt
+    for log in backup_logs[-10:]:
+        if "error" in str(log).lower():
+            messages.append(("danger", f"❌ {log}"))
+        else:
+            messages.append(("info", f"ℹ️ {log}"))
+    return False, messages
 
-    return redirect(url_for("blockchain_admin"))
+
+@app.route("/admin/backup-ipfs", methods=["POST"])
+@admin_required
+def backup_to_ipfs():
+    """Backup blockchain to IPFS (Admin only)"""
+    task_id = submit_admin_task(
+        ipfs_executor, "IPFS backup", _ipfs_backup_job, session.get("user_id", 1)
+    )
+    flash("⏳ IPFS upload started in the background", "info")
+    return redirect(url_for("blockchain_admin", task=task_id))
+
+
+@app.route("/admin/blockchain/task/<task_id>")
+@admin_required
+def admin_task_status(task_id):
+    """Status and result messages of a background backup job"""
+    task = admin_tasks.get(task_id)
+    if task is None:
+        return jsonify({"state": "UNKNOWN", "messages": []}), 404
+
+    return jsonify(
+        {
+            "id": task["id"],
+            "name": task["name"],
+            "state": task["state"],
+            "messages": [
+                {"category": category, "message": message}
+                for category, message in task["messages"]
+            ],
+        }
+    )
+
+
+# CIDv0: "Qm" + 44 base58btc chars (46 total)
+# CIDv1: "baf" + base32 lowercase, variable length (typically 59 chars)
+_CID_RE = re.compile(r"Qm[1-9A-HJ-NP-Za-km-z]{44}|baf[a-z2-7]{47,}")
 
 
 @app.route("/admin/restore-ipfs", methods=["POST"])
 @admin_required
 def restore_from_ipfs():
     """Restore blockchain from IPFS using CID (Admin only)"""
-    global blockchain
-
     cid = request.form.get("ipfs_cid", "").strip()
 
     if not cid:
         flash("❌ No IPFS CID provided", "danger")
         return redirect(url_for("blockchain_admin"))
 
-    # Basic CID validation (Qm... for CIDv0 or baf... for CIDv1)
-    # CIDv0: starts with Qm, 46 chars
-    # CIDv1: starts with baf, variable length (typically 59+ chars)
-    cid = cid.strip()  # Remove any whitespace
-    is_valid_cid = (
-        (cid.startswith("Qm") and len(cid) >= 46)  # CIDv0
-        or (cid.startswith("baf") and len(cid) >= 50)  # CIDv1
-    )
-    if not is_valid_cid:
+    if not _CID_RE.fullmatch(cid):
         flash(
             f'❌ Invalid IPFS CID format. CID should start with "Qm" (v0) or "baf" (v1)',
             "danger",
@@ -1348,20 +1845,35 @@ def restore_from_ipfs():
             flash(f"Current blockchain backed up to: {pre_restore_backup}", "info")
 
         # Clear logs before restore attempt
-        blockchain.logs = []
+        blockchain.logs.clear()
 
         # Restore from IPFS
         result = blockchain.restore_from_ipfs(cid)
 
         if result:
-            # Reload the blockchain instance
-            blockchain = PropertyBlockchain(verbose=True)
-            flash(f"✅ Blockchain restored from IPFS! CID: {cid}", "success")
-            flash(f"Loaded {len(blockchain.chain)} blocks", "info")
+            # Reload the blockchain instance from the restored file. Loaded
+            # here rather than via from_storage_file() so a failed load still
+            # leaves its logs to report.
+            restored = PropertyBlockchain(verbose=True, load_existing=False)
+            if restored._load_blockchain():
+                blockchain.replace(restored)
+                flash(f"✅ Blockchain restored from IPFS! CID: {cid}", "success")
+                flash(f"Loaded {len(blockchain.chain)} blocks", "info")
+            else:
+                # The live chain was not replaced - say why
+                flash(
+                    "❌ IPFS file downloaded but could not be loaded. The current blockchain is still in use.",
+                    "danger",
+                )
+                for log in restored.recent_logs(10):
+                    if "error" in str(log).lower() or "failed" in str(log).lower():
+                        flash(f"❌ {log}", "danger")
+                    else:
+                        flash(f"ℹ️ {log}", "info")
         else:
             # Show ALL logs for debugging
             if hasattr(blockchain, "logs") and blockchain.logs:
-                for log in blockchain.logs[-10:]:
+                for log in blockchain.recent_logs(10):
                     if "error" in str(log).lower() or "failed" in str(log).lower():
                         flash(f"❌ {log}", "danger")
                     else:
@@ -1409,6 +1921,40 @@ def inject_user():
 # ============================================================================
 
 
+# Gemini answers keyed on (role, question digest); repeated questions skip the API
+CHAT_CACHE_MAX = 2048
+CHAT_CACHE_TTL = 3600  # seconds
+_chat_answer_cache = OrderedDict()
+_chat_answer_cache_lock = threading.Lock()
+
+
+def _chat_cache_key(user_role, question):
+    normalized = " ".join(question.lower().split())
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return user_role, digest
+
+
+def _get_cached_answer(key):
+    with _chat_answer_cache_lock:
+        entry = _chat_answer_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, answer = entry
+        if expires_at < time.monotonic():
+            del _chat_answer_cache[key]
+            return None
+        _chat_answer_cache.move_to_end(key)
+        return answer
+
+
+def _store_cached_answer(key, answer):
+    with _chat_answer_cache_lock:
+        _chat_answer_cache[key] = (time.monotonic() + CHAT_CACHE_TTL, answer)
+        _chat_answer_cache.move_to_end(key)
+        while len(_chat_answer_cache) > CHAT_CACHE_MAX:
+            _chat_answer_cache.popitem(last=False)
+
+
 @app.route("/chatbot/ask", methods=["POST"])
 def chatbot_ask():
     """AI Chatbot powered by Gemini for property-related queries"""
@@ -1459,14 +2005,20 @@ If asked about something outside property/blockchain, politely redirect to prope
 User Question: """
 
         # Try Gemini API first, fallback to rule-based if unavailable
+        gemini_client = get_gemini_client()
         if gemini_client:
-            try:
-                response = gemini_client.models.generate_content(
-                    model="gemini-2.0-flash", contents=system_context + user_question
-                )
-                answer = response.text.strip()
-            except Exception:
-                answer = get_fallback_answer(user_question, user_role)
+            cache_key = _chat_cache_key(user_role, user_question)
+            answer = _get_cached_answer(cache_key)
+            if answer is None:
+                try:
+                    response = gemini_client.models.generate_content(
+                        model="gemini-2.0-flash", contents=system_context + user_question
+                    )
+                    answer = response.text.strip()
+                    _store_cached_answer(cache_key, answer)
+                except Exception:
+                    # Fallback answers are not cached - Gemini may be back next time
+                    answer = get_fallback_answer(user_question, user_role)
         else:
             answer = get_fallback_answer(user_question, user_role)
 
@@ -1481,94 +2033,113 @@ User Question: """
         )
 
 
-def get_fallback_answer(question, user_role="user"):
-    """Rule-based fallback answers when Gemini is unavailable"""
-    q = question.lower()
+def _keyword_pattern(*words):
+    """One compiled alternation for a keyword group (plain substring match)"""
+    return re.compile("|".join(map(re.escape, words)))
 
-    # Check if user is asking about transfer, inheritance, or appointment-related actions
-    is_transfer_query = any(
-        word in q for word in ["transfer", "ownership", "sell", "buy"]
-    )
-    is_inheritance_query = any(
-        word in q for word in ["inherit", "inheritance", "heir", "succession"]
-    )
-    is_appointment_query = any(
-        word in q for word in ["appointment", "official", "meeting", "schedule", "book"]
-    )
 
-    # For regular users asking about transfers or inheritance, direct them to appointments
-    if user_role == "user" and (
-        is_transfer_query or is_inheritance_query or is_appointment_query
-    ):
-        if is_transfer_query:
-            return "📅 To transfer property ownership, please schedule an appointment with an official. Go to your Dashboard → 'My Appointments' section → 'Request New Appointment' → Select 'Transfer' as the type. An officer will guide you through the process and handle the transfer."
-        elif is_inheritance_query:
-            return "📅 To record inheritance, please schedule an appointment with an official. Go to your Dashboard → 'My Appointments' section → 'Request New Appointment' → Select 'Inheritance' as the type. An officer will help you complete the inheritance process."
-        else:
-            return "📅 To schedule an appointment: Go to your Dashboard → 'My Appointments' section → 'Request New Appointment' → Select date, time, and purpose (Transfer/Inheritance) → Submit. Officials will accept/reschedule and chat with you to complete the process."
+_FALLBACK_TRANSFER = _keyword_pattern("transfer", "ownership", "sell", "buy")
+_FALLBACK_INHERITANCE = _keyword_pattern("inherit", "inheritance", "heir", "succession")
+_FALLBACK_APPOINTMENT = _keyword_pattern(
+    "appointment", "official", "meeting", "schedule", "book"
+)
 
+# (keywords, roles allowed or None for everyone, answer) - first match wins
+_FALLBACK_RULES = (
     # Registration queries
-    if any(
-        word in q
-        for word in ["register", "registration", "add property", "new property"]
-    ):
-        return "📝 To register a property: Click 'Add Property' → Fill in owner details (Name, Aadhar, PAN) → Enter property details (address, survey number, land info) → Submit. Registration fee is ₹5,000."
-
+    (
+        _keyword_pattern("register", "registration", "add property", "new property"),
+        None,
+        "📝 To register a property: Click 'Add Property' → Fill in owner details (Name, Aadhar, PAN) → Enter property details (address, survey number, land info) → Submit. Registration fee is ₹5,000.",
+    ),
     # Fee queries
-    elif any(
-        word in q for word in ["fee", "cost", "charge", "price", "payment", "how much"]
-    ):
-        return "💰 **Fees:** Registration = ₹5,000 | Transfer = ₹3,000 + Stamp Duty (2%) + Registration Fee (5% of property value). Example: For ₹50 lakh property → ₹1 lakh stamp + ₹2.5 lakh reg fee."
-
+    (
+        _keyword_pattern("fee", "cost", "charge", "price", "payment", "how much"),
+        None,
+        "💰 **Fees:** Registration = ₹5,000 | Transfer = ₹3,000 + Stamp Duty (2%) + Registration Fee (5% of property value). Example: For ₹50 lakh property → ₹1 lakh stamp + ₹2.5 lakh reg fee.",
+    ),
     # Transfer queries (for officers/admins)
-    elif is_transfer_query and user_role in ["admin", "officer"]:
-        return "🔄 To transfer property: Go to 'Transfer Property' → Enter property key → New owner's details (Aadhar, PAN) → Transaction value → Submit. Stamp duty & reg fee calculated automatically."
-
+    (
+        _FALLBACK_TRANSFER,
+        ("admin", "officer"),
+        "🔄 To transfer property: Go to 'Transfer Property' → Enter property key → New owner's details (Aadhar, PAN) → Transaction value → Submit. Stamp duty & reg fee calculated automatically.",
+    ),
     # Inheritance queries (for officers/admins)
-    elif is_inheritance_query and user_role in ["admin", "officer"]:
-        return "👨‍👩‍👦 To record inheritance: Click 'Inherit Property' → Property key → Heir's details (Aadhar, PAN) → Relationship → Submit. Usually lower/no stamp duty for inheritance."
-
+    (
+        _FALLBACK_INHERITANCE,
+        ("admin", "officer"),
+        "👨‍👩‍👦 To record inheritance: Click 'Inherit Property' → Property key → Heir's details (Aadhar, PAN) → Relationship → Submit. Usually lower/no stamp duty for inheritance.",
+    ),
     # Document queries
-    elif any(
-        word in q for word in ["document", "documents", "required", "need", "papers"]
-    ):
-        return "📄 **Required documents:** Valid Aadhar card (12 digits), PAN card (ABCDE1234F format), property ownership proof, survey number, address details, and land measurement documents."
-
+    (
+        _keyword_pattern("document", "documents", "required", "need", "papers"),
+        None,
+        "📄 **Required documents:** Valid Aadhar card (12 digits), PAN card (ABCDE1234F format), property ownership proof, survey number, address details, and land measurement documents.",
+    ),
     # Blockchain/Security queries
-    elif any(
-        word in q for word in ["blockchain", "security", "safe", "tamper", "hack"]
-    ):
-        return "🔐 Our blockchain uses SHA-256 cryptography + proof-of-work mining. Every record is permanent, tamper-proof, and publicly verifiable. No one can alter past transactions without detection."
-
+    (
+        _keyword_pattern("blockchain", "security", "safe", "tamper", "hack"),
+        None,
+        "🔐 Our blockchain uses SHA-256 cryptography + proof-of-work mining. Every record is permanent, tamper-proof, and publicly verifiable. No one can alter past transactions without detection.",
+    ),
     # History/View queries
-    elif any(word in q for word in ["history", "view", "check", "see", "track"]):
-        return "🔍 To view property history: Search property → 'View Property' → 'View Transaction History'. You'll see complete ownership chain, all transfers, values, and dates - fully transparent!"
-
+    (
+        _keyword_pattern("history", "view", "check", "see", "track"),
+        None,
+        "🔍 To view property history: Search property → 'View Property' → 'View Transaction History'. You'll see complete ownership chain, all transfers, values, and dates - fully transparent!",
+    ),
     # Search queries
-    elif any(word in q for word in ["search", "find", "locate", "look"]):
-        return "🔎 **Search options:** 'Search by Owner' (find all properties of a person) | 'All Properties' (browse complete registry) | Enter property key for specific property details."
-
+    (
+        _keyword_pattern("search", "find", "locate", "look"),
+        None,
+        "🔎 **Search options:** 'Search by Owner' (find all properties of a person) | 'All Properties' (browse complete registry) | Enter property key for specific property details.",
+    ),
     # Aadhar/PAN queries
-    elif any(word in q for word in ["aadhar", "pan", "id", "identification"]):
-        return "🆔 Aadhar must be exactly 12 digits. PAN must follow format: ABCDE1234F (5 letters, 4 numbers, 1 letter). Both are mandatory for all property transactions."
-
+    (
+        _keyword_pattern("aadhar", "pan", "id", "identification"),
+        None,
+        "🆔 Aadhar must be exactly 12 digits. PAN must follow format: ABCDE1234F (5 letters, 4 numbers, 1 letter). Both are mandatory for all property transactions.",
+    ),
     # Chat/Support queries
-    elif any(word in q for word in ["chat", "message", "contact", "talk", "speak"]):
-        return "💬 Book an appointment to chat with officials! They can answer specific questions about your property, guide you through processes, and handle special cases."
-
+    (
+        _keyword_pattern("chat", "message", "contact", "talk", "speak"),
+        None,
+        "💬 Book an appointment to chat with officials! They can answer specific questions about your property, guide you through processes, and handle special cases.",
+    ),
     # Greeting
-    elif any(
-        word in q for word in ["hello", "hi", "hey", "good morning", "good afternoon"]
-    ):
-        return "👋 Hello! I'm PawParties AI Assistant. I can help you with property registration, transfers, fees, appointments, and more. What would you like to know?"
-
+    (
+        _keyword_pattern("hello", "hi", "hey", "good morning", "good afternoon"),
+        None,
+        "👋 Hello! I'm PawParties AI Assistant. I can help you with property registration, transfers, fees, appointments, and more. What would you like to know?",
+    ),
     # Thanks
-    elif any(word in q for word in ["thank", "thanks", "appreciate"]):
-        return "😊 You're welcome! Feel free to ask if you have more questions. Happy to help!"
+    (
+        _keyword_pattern("thank", "thanks", "appreciate"),
+        None,
+        "😊 You're welcome! Feel free to ask if you have more questions. Happy to help!",
+    ),
+)
+
+
+def get_fallback_answer(question, user_role="user"):
+    """Rule-based fallback answers when Gemini is unavailable"""
+    q = question.lower()
+
+    # For regular users asking about transfers or inheritance, direct them to appointments
+    if user_role == "user":
+        if _FALLBACK_TRANSFER.search(q):
+            return "📅 To transfer property ownership, please schedule an appointment with an official. Go to your Dashboard → 'My Appointments' section → 'Request New Appointment' → Select 'Transfer' as the type. An officer will guide you through the process and handle the transfer."
+        elif _FALLBACK_INHERITANCE.search(q):
+            return "📅 To record inheritance, please schedule an appointment with an official. Go to your Dashboard → 'My Appointments' section → 'Request New Appointment' → Select 'Inheritance' as the type. An officer will help you complete the inheritance process."
+        elif _FALLBACK_APPOINTMENT.search(q):
+            return "📅 To schedule an appointment: Go to your Dashboard → 'My Appointments' section → 'Request New Appointment' → Select date, time, and purpose (Transfer/Inheritance) → Submit. Officials will accept/reschedule and chat with you to complete the process."
+
+    for keywords, roles, answer in _FALLBACK_RULES:
+        if (roles is None or user_role in roles) and keywords.search(q):
+            return answer
 
     # Default response
-    else:
-        return "🤖 I can help you with: **Property Registration, Transfers, Inheritance, Fees & Costs, Documents, Appointments, Blockchain Security, Search & History**. What would you like to know about?"
+    return "🤖 I can help you with: **Property Registration, Transfers, Inheritance, Fees & Costs, Documents, Appointments, Blockchain Security, Search & History**. What would you like to know about?"
 
 
 # ============================================================================
@@ -1585,4 +2156,5 @@ if __name__ == "__main__":
     print("\nIMPORTANT: Change default passwords in production!")
     print("=" * 60 + "\n")
 
-    app.run(debug=True, host="127.0.0.1", port=5000)
+    # Development server only - production runs gunicorn (see wsgi.py)
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", host="127.0.0.1", port=5000)
@@ -3,10 +3,302 @@ Authentication service for user login and session management
 Handles all security and access control
 """
 
-from flask import session, redirect, url_for, flash
-from models import User, db
+import threading
+import time
+from datetime import datetime
+from flask import current_app, session, redirect, url_for, flash, g, jsonify, request
+from sqlalchemy import bindparam, event, literal, select, union_all, update
+from sqlalchemy.orm import Session, object_session
+from models import User, db, hash_password, password_needs_rehash, verify_password
 from functools import wraps
-from typing import Optional
+from typing import NamedTuple, Optional
+
+
+class UserRecord(NamedTuple):
+    """Plain snapshot of the User columns login needs (safe to share across requests)"""
+    id: int
+    username: str
+    password: str
+    role: str
+    full_name: str
+    is_active: bool
+
+
+# Every user is kept in memory and reloaded from the database every
+# AUTH_WORKER_INTERVAL seconds, so login lookups are dict hits. Role or
+# is_active changes made outside this process show up within one interval.
+_USERS = {}        # id -> UserRecord
+_BY_USERNAME = {}  # username -> id
+_BY_PAN = {}       # pan -> id
+_BY_AADHAR = {}    # aadhar -> id
+_users_lock = threading.Lock()
+_users_loaded = False
+
+# Login IDs that matched nobody since the last refresh, so repeated failed
+# logins (typos, credential stuffing) don't query the database again
+_UNKNOWN_LOGIN_IDS = set()
+UNKNOWN_LOGIN_IDS_MAX = 10_000
+
+_USER_SNAPSHOT_COLUMNS = (User.id, User.username, User.password, User.role,
+                          User.full_name, User.is_active, User.pan, User.aadhar)
+
+# Snapshot-miss lookups, built once with bound parameters so each call skips
+# statement construction and reuses the compiled SQL. The login lookup is
+# three equality probes on indexed columns (username, then PAN, then Aadhar) -
+# the database stops at the first match.
+_USER_BY_LOGIN_STMT = union_all(
+    select(*_USER_SNAPSHOT_COLUMNS).where(User.username == bindparam('login_id')),
+    select(*_USER_SNAPSHOT_COLUMNS).where(User.pan == bindparam('login_id')),
+    select(*_USER_SNAPSHOT_COLUMNS).where(User.aadhar == bindparam('login_id')),
+).limit(1)
+_USER_BY_ID_STMT = select(*_USER_SNAPSHOT_COLUMNS).where(User.id == bindparam('user_id'))
+_USERNAME_TAKEN_STMT = (
+    select(literal(1)).where(User.username == bindparam('username')).limit(1)
+)
+
+
+def _remember_user(user_id, username, password, role, full_name, is_active,
+                   pan, aadhar) -> UserRecord:
+    """Add or update one user in the snapshot"""
+    record = UserRecord(user_id, username, password, role, full_name, bool(is_active))
+    with _users_lock:
+        _UNKNOWN_LOGIN_IDS.difference_update((username, pan, aadhar))
+        _USERS[user_id] = record
+        _BY_USERNAME[username] = user_id
+        if pan:
+            _BY_PAN[pan] = user_id
+        if aadhar:
+            _BY_AADHAR[aadhar] = user_id
+    return record
+
+
+def _forget_user_id(user_id: int) -> None:
+    """Remove one user from the snapshot"""
+    with _users_lock:
+        record = _USERS.pop(user_id, None)
+        if record is None:
+            return
+        for index in (_BY_USERNAME, _BY_PAN, _BY_AADHAR):
+            for key in [key for key, value in index.items() if value == user_id]:
+                del index[key]
+
+
+# User rows changed through the ORM in this process update the snapshot as
+# soon as their transaction commits (other workers catch up on refresh)
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+def _queue_user_change(mapper, connection, target):
+    object_session(target).info.setdefault('changed_users', {})[target.id] = (
+        target.id, target.username, target.password, target.role,
+        target.full_name, target.is_active, target.pan, target.aadhar
+    )
+
+
+@event.listens_for(User, 'after_delete')
+def _queue_user_delete(mapper, connection, target):
+    object_session(target).info.setdefault('changed_users', {})[target.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_user_changes(session):
+    for user_id, row in session.info.pop('changed_users', {}).items():
+        if row is None:
+            _forget_user_id(user_id)
+        else:
+            _remember_user(*row)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_user_changes(session, previous_transaction):
+    session.info.pop('changed_users', None)
+
+
+def refresh_user_snapshot() -> None:
+    """Reload every user from the database (needs an app context)"""
+    global _USERS, _BY_USERNAME, _BY_PAN, _BY_AADHAR, _UNKNOWN_LOGIN_IDS, _users_loaded
+    users, by_username, by_pan, by_aadhar = {}, {}, {}, {}
+    for user_id, username, password, role, full_name, is_active, pan, aadhar in (
+        db.session.execute(select(*_USER_SNAPSHOT_COLUMNS))
+    ):
+        users[user_id] = UserRecord(user_id, username, password, role,
+                                    full_name, bool(is_active))
+        by_username[username] = user_id
+        if pan:
+            by_pan[pan] = user_id
+        if aadhar:
+            by_aadhar[aadhar] = user_id
+
+    with _users_lock:
+        _USERS, _BY_USERNAME, _BY_PAN, _BY_AADHAR = users, by_username, by_pan, by_aadhar
+        _UNKNOWN_LOGIN_IDS = set()
+        _users_loaded = True
+
+
+def _lookup_user(login_id: str) -> Optional[UserRecord]:
+    """Find a user by username, then PAN, then Aadhar"""
+    if not _users_loaded:
+        refresh_user_snapshot()
+        _start_auth_worker()
+
+    record = _USERS.get(
+        _BY_USERNAME.get(login_id) or _BY_PAN.get(login_id) or _BY_AADHAR.get(login_id)
+    )
+    if record is not None or login_id in _UNKNOWN_LOGIN_IDS:
+        return record
+
+    # Not in the snapshot (e.g. registered through another worker since the
+    # last refresh)
+    row = db.session.execute(_USER_BY_LOGIN_STMT, {'login_id': login_id}).first()
+    if row is not None:
+        return _remember_user(*row)
+    with _users_lock:
+        if len(_UNKNOWN_LOGIN_IDS) >= UNKNOWN_LOGIN_IDS_MAX:
+            _UNKNOWN_LOGIN_IDS.clear()
+        _UNKNOWN_LOGIN_IDS.add(login_id)
+    return None
+
+
+def _user_by_id(user_id: int) -> Optional[UserRecord]:
+    """Find a user by id, from the snapshot when possible"""
+    if not _users_loaded:
+        refresh_user_snapshot()
+        _start_auth_worker()
+
+    record = _USERS.get(user_id)
+    if record is not None:
+        return record
+    row = db.session.execute(_USER_BY_ID_STMT, {'user_id': user_id}).first()
+    return _remember_user(*row) if row is not None else None
+
+
+# last_login timestamps are buffered and written in one batched UPDATE by the
+# auth worker, so login doesn't wait on a commit
+_pending_last_login = {}  # user_id -> datetime of latest login
+_pending_last_login_lock = threading.Lock()
+
+
+def _record_last_login(user_id: int) -> None:
+    """Buffer a login time for the next flush"""
+    with _pending_last_login_lock:
+        _pending_last_login[user_id] = datetime.utcnow()
+    _start_auth_worker()
+
+
+def flush_last_logins() -> int:
+    """
+    Write buffered last_login timestamps (needs an app context)
+    Returns the number of users updated
+    """
+    with _pending_last_login_lock:
+        if not _pending_last_login:
+            return 0
+        pending = dict(_pending_last_login)
+        _pending_last_login.clear()
+
+    try:
+        db.session.execute(
+            update(User),
+            [{'id': user_id, 'last_login': ts} for user_id, ts in pending.items()]
+        )
+        db.session.commit()
+        return len(pending)
+    except Exception as e:
+        db.session.rollback()
+        # Put them back for the next flush, unless a newer login replaced them
+        with _pending_last_login_lock:
+            for user_id, ts in pending.items():
+                _pending_last_login.setdefault(user_id, ts)
+        print(f"⚠️ last_login flush failed: {e}")
+        return 0
+
+
+# Background worker: every AUTH_WORKER_INTERVAL seconds (overridable through
+# app config) it writes buffered last_login times and reloads the user snapshot
+AUTH_WORKER_INTERVAL = 30  # seconds
+_auth_worker = None
+_auth_worker_lock = threading.Lock()
+
+
+def _start_auth_worker() -> None:
+    """Start the worker thread on first use (needs an app context)"""
+    global _auth_worker
+    if _auth_worker is None:
+        with _auth_worker_lock:
+            if _auth_worker is None:
+                _auth_worker = threading.Thread(
+                    target=_auth_worker_loop,
+                    args=(current_app._get_current_object(),),
+                    name="auth-worker",
+                    daemon=True,
+                )
+                _auth_worker.start()
+
+
+def _auth_worker_loop(app) -> None:
+    while True:
+        time.sleep(app.config.get('AUTH_WORKER_INTERVAL', AUTH_WORKER_INTERVAL))
+        with app.app_context():
+            flush_last_logins()
+            try:
+                refresh_user_snapshot()
+            except Exception as e:
+                db.session.rollback()
+                print(f"⚠️ User snapshot refresh failed: {e}")
+
+
+# Role bitmasks - decorators test the request's role bit against the roles they allow
+ROLE_USER = 1
+ROLE_OFFICER = 2
+ROLE_ADMIN = 4
+ROLE_BITS = {'user': ROLE_USER, 'officer': ROLE_OFFICER, 'admin': ROLE_ADMIN}
+
+
+def load_request_auth():
+    """
+    Resolve the logged-in user once per request
+    The session only holds user_id; the rest comes from the user snapshot.
+    Registered as a before_request hook (_auth_context() also calls it lazily)
+    """
+    user = None
+    user_id = session.get('user_id')
+    if user_id is not None:
+        user = _user_by_id(user_id)
+        if user is None or not user.is_active:
+            # Deleted or deactivated since login - end the session
+            session.pop('user_id', None)
+            user = None
+    _set_request_auth(user)
+
+
+def _set_request_auth(user: Optional[UserRecord]) -> None:
+    g.pop('current_user', None)
+    g._auth_ctx = (user, ROLE_BITS.get(user.role, 0) if user else 0)
+
+
+def _auth_context() -> tuple[Optional[UserRecord], int]:
+    """(user record or None, role bit) for this request, resolved on first use"""
+    ctx = g.get('_auth_ctx')
+    if ctx is None:
+        load_request_auth()
+        ctx = g._auth_ctx
+    return ctx
+
+
+_MISSING = object()
+
+
+def _memo_g(key: str):
+    """Cache a no-argument function's result on flask.g under `key` for the request"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper():
+            value = g.get(key, _MISSING)
+            if value is _MISSING:
+                value = fn()
+                setattr(g, key, value)
+            return value
+        return wrapper
+    return decorator
 
 
 class AuthService:
@@ -16,10 +308,12 @@ class AuthService:
     def register_user(full_name: str, customer_key: str, pan: str, aadhar: str, password: str) -> tuple[bool, Optional[User], str]:
         """
         Register a new user with the 'user' role using Customer Key as username.
+        The user is flushed (so it has an id) but not committed - the caller
+        commits it together with anything else it adds.
         Returns: (success, user_object, message)
         """
         # Use Customer Key as the username, ensuring it's unique
-        if User.query.filter_by(username=customer_key).first():
+        if db.session.execute(_USERNAME_TAKEN_STMT, {'username': customer_key}).first():
             return False, None, "A user with this Customer Key is already registered."
 
         new_user = User(
@@ -28,30 +322,26 @@ class AuthService:
             aadhar=aadhar,
             pan=pan,
             role='user',
-            password=password
+            password=hash_password(password)
         )
         
         try:
             db.session.add(new_user)
-            db.session.commit()
+            db.session.flush()
             return True, new_user, "Registration successful. Please log in."
         except Exception as e:
             db.session.rollback()
             return False, None, f"Registration failed: {str(e)}"
     
     @staticmethod
-    def login_user(username: str, password: str) -> tuple[bool, Optional[User], str]:
+    def login_user(username: str, password: str) -> tuple[bool, Optional[UserRecord], str]:
         """
         Authenticate user and create session
         Accepts username, PAN, or Aadhar for login
-        Returns: (success, user_object, message)
+        Returns: (success, user_record, message)
         """
         # Try to find user by username, PAN, or Aadhar
-        user = User.query.filter(
-            (User.username == username) |
-            (User.pan == username) |
-            (User.aadhar == username)
-        ).first()
+        user = _lookup_user(username)
         
         if not user:
             return False, None, "Invalid login ID or password"
@@ -59,18 +349,29 @@ class AuthService:
         if not user.is_active:
             return False, None, "Account is deactivated"
         
-        if user.password != password:
+        if not verify_password(user.password, password):
             return False, None, "Invalid login ID or password"
         
-        # Update last login
-        user.update_last_login()
+        # Hash a legacy plaintext password while we have it
+        if password_needs_rehash(user.password):
+            password_hash = hash_password(password)
+            db.session.execute(
+                update(User).where(User.id == user.id).values(password=password_hash)
+            )
+            db.session.commit()
+            with _users_lock:
+                _USERS[user.id] = user._replace(password=password_hash)
+        
+        # Update last login (written by the background flush)
+        _record_last_login(user.id)
         
-        # Create session
+        # Start a fresh session holding just the id - everything else is looked
+        # up per request, and keys left by older logins (username, role,
+        # full_name) stop riding along in the cookie
+        session.clear()
         session.permanent = True
         session['user_id'] = user.id
-        session['username'] = user.username
-        session['role'] = user.role
-        session['full_name'] = user.full_name
+        _set_request_auth(user)
         
         return True, user, "Login successful"
     
@@ -78,107 +379,104 @@ class AuthService:
     def logout_user():
         """Clear user session"""
         session.clear()
+        _set_request_auth(None)
     
     @staticmethod
+    @_memo_g('current_user')
     def get_current_user() -> Optional[dict]:
-        """Get current logged-in user from session"""
-        if 'user_id' in session:
+        """
+        Get current logged-in user
+        Built once per request and cached on flask.g (routes, decorators and the
+        template context processor all ask for it)
+        """
+        user = _auth_context()[0]
+        if user is not None:
             return {
-                'id': session['user_id'],
-                'username': session['username'],
-                'role': session['role'],
-                'full_name': session['full_name']
+                'id': user.id,
+                'username': user.username,
+                'role': user.role,
+                'full_name': user.full_name
             }
         return None
     
     @staticmethod
     def is_authenticated() -> bool:
         """Check if user is logged in"""
-        return 'user_id' in session
+        return _auth_context()[0] is not None
     
     @staticmethod
     def is_admin() -> bool:
         """Check if current user is admin"""
-        return session.get('role') == 'admin'
+        return bool(_auth_context()[1] & ROLE_ADMIN)
     
     @staticmethod
     def is_officer() -> bool:
         """Check if current user is officer"""
-        return session.get('role') == 'officer'
+        return bool(_auth_context()[1] & ROLE_OFFICER)
 
     @staticmethod
     def is_user() -> bool:
         """Check if current user is a regular user"""
-        return session.get('role') == 'user'
+        return bool(_auth_context()[1] & ROLE_USER)
 
 
 # Decorator functions for route protection
 
-def login_required(f):
-    """
-    Decorator to require login for a route
-    Redirects to login page if not authenticated
-    """
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not AuthService.is_authenticated():
-            flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
-        return f(*args, **kwargs)
-    return decorated_function
+# Paths of the redirect targets, resolved through the URL map on first use
+_redirect_urls = {}
 
 
-def admin_required(f):
-    """
-    Decorator to require admin role for a route
-    Officers cannot access admin-only routes
-    """
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not AuthService.is_authenticated():
-            flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
-        
-        if not AuthService.is_admin():
-            flash('Admin privileges required for this action.', 'danger')
-            return redirect(url_for('dashboard'))
-        
-        return f(*args, **kwargs)
-    return decorated_function
+def _redirect_to(endpoint: str):
+    url = _redirect_urls.get(endpoint)
+    if url is None:
+        url = _redirect_urls[endpoint] = url_for(endpoint)
+    return redirect(url)
 
 
-def officer_or_admin_required(f):
-    """
-    Decorator to require officer or admin role
-    This is the standard protection for most routes
-    """
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not AuthService.is_authenticated():
-            flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
-        
-        if not (AuthService.is_officer() or AuthService.is_admin()):
-            flash('Insufficient privileges.', 'danger')
-            return redirect(url_for('dashboard'))
-        
-        return f(*args, **kwargs)
-    return decorated_function
+def _wants_json() -> bool:
+    """True for fetch/EventSource callers that can't use a flash + redirect"""
+    return request.is_json or request.accept_mimetypes.best in (
+        'application/json', 'text/event-stream'
+    )
+
 
+def _login_redirect():
+    if _wants_json():
+        return jsonify(error='Authentication required'), 401
+    flash('Please log in to access this page.', 'warning')
+    return _redirect_to('login')
 
-def user_required(f):
+
+def require(allowed_roles: int = 0, message: str = 'Insufficient privileges.'):
     """
-    Decorator to require 'user' role for a route.
+    Decorator factory for route protection
+    Requires login, and when allowed_roles is given (ROLE_* bits OR-ed together)
+    one of those roles; otherwise flashes `message` and redirects to the dashboard
     """
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not AuthService.is_authenticated():
-            flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
-        
-        if not AuthService.is_user():
-            flash('This page is for users only.', 'danger')
-            return redirect(url_for('dashboard'))
-            
-        return f(*args, **kwargs)
-    return decorated_function
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user, role = _auth_context()
+            if user is None:
+                return _login_redirect()
+            if allowed_roles and not role & allowed_roles:
+                if _wants_json():
+                    return jsonify(error=message), 403
+                flash(message, 'danger')
+                return _redirect_to('dashboard')
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+# Require login for a route
+login_required = require()
+
+# Require admin role (officers cannot access admin-only routes)
+admin_required = require(ROLE_ADMIN, 'Admin privileges required for this action.')
+
+# Require officer or admin role - the standard protection for most routes
+officer_or_admin_required = require(ROLE_OFFICER | ROLE_ADMIN)
+
+# Require the 'user' role
+user_required = require(ROLE_USER, 'This page is for users only.')
@@ -7,20 +7,30 @@ NO DATABASE STORAGE - All property data lives ONLY in the blockchain.
 SQLite is used ONLY for officer authentication in the Flask app.
 """
 
-import base64
-import copy
+import binascii
+import bisect
 import hashlib
+import itertools
 import json
 import logging
 import os
+import re
+import secrets
 import subprocess
-import uuid
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
 
-import requests
 from dotenv import load_dotenv
 
+try:
+    import orjson  # optional - faster parsing of the stored chain
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -30,10 +40,144 @@ from cid_manager import cid_manager
 # Configure logging (optional - can be disabled)
 logger = logging.getLogger(__name__)
 
+# Block hashing helpers, bound once: json.dumps() builds a new encoder on every
+# call when given non-default options, and hashing runs for every block on
+# each validation pass
+_sha256 = hashlib.sha256
+_canonical_json = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), ensure_ascii=True
+).encode
+_canonical_str = json.encoder.encode_basestring_ascii
+
+
+# Identity format checks run on every registration and transfer
+_PAN_RE = re.compile(r"^[A-Z]{5}[0-9]{4}[A-Z]{1}$")
+_AADHAR_STRIP = str.maketrans("", "", " -")
+
+
+def _json_loads(json_data: str) -> Any:
+    """
+    Parse stored blockchain JSON, with orjson when it is installed.
+    Hashing stays on the stdlib encoder: orjson's output differs (raw
+    non-ASCII, exponent format, NaN as null), which would change block hashes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(json_data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN, which only the stdlib parser accepts
+    return json.loads(json_data)
+
+
+# Storage file key (deterministic but obfuscated)
+_STORAGE_KEY = hashlib.sha256(b"pawperty_blockchain_key").digest()
+# Encryption piece size: a multiple of the 32-byte key and of base64's 3-byte
+# groups (96), just under 64 KiB
+_STORAGE_CHUNK = 96 * 682
+
+
+def _xor_with_storage_key(data: Union[bytes, memoryview]) -> bytes:
+    """
+    XOR data with the repeating storage key. Both sides are turned into one
+    big integer each, so the XOR is a single C-level operation instead of a
+    Python loop over every byte of the chain file.
+    """
+    size = len(data)
+    if not size:
+        return b""
+    repeats, extra = divmod(size, len(_STORAGE_KEY))
+    key_stream = _STORAGE_KEY * repeats + _STORAGE_KEY[:extra]
+    return (
+        int.from_bytes(data, "little") ^ int.from_bytes(key_stream, "little")
+    ).to_bytes(size, "little")
+
+
+# unified_search fields: (state key, weight, strip spaces/dashes, fuzzy match)
+_SEARCH_FIELDS = (
+    ("property_key", 1.0, False, False),
+    ("owner", 1.0, False, True),
+    ("customer_key", 0.95, False, False),
+    ("survey_no", 0.9, False, False),
+    ("rtc_no", 0.9, False, False),
+    ("aadhar_no", 0.85, True, False),
+    ("pan_no", 0.85, False, False),
+    ("village", 0.7, False, False),
+    ("district", 0.7, False, False),
+    ("taluk", 0.7, False, False),
+    ("pincode", 0.8, False, False),
+    ("address", 0.6, False, False),
+)
+
+# Messages logged by the current thread inside PropertyBlockchain.capture_logs()
+_log_capture = threading.local()
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_score(query: str, target: str) -> float:
+    """
+    Score behind PropertyBlockchain._calculate_fuzzy_score. It depends only
+    on the two strings, so it is memoized: an owner with many properties is scored
+    once per query instead of once per property.
+    """
+    query = query.lower().strip()
+    target = target.lower().strip()
+
+    if not query or not target:
+        return 0.0
+
+    # Exact match
+    if query == target:
+        return 100.0
+
+    # Query is a substring of target (partial match)
+    if query in target:
+        return 90.0 + (len(query) / len(target)) * 10
+
+    # Target starts with query
+    if target.startswith(query):
+        return 85.0 + (len(query) / len(target)) * 10
+
+    # Target contains all words from query
+    query_words = query.split()
+    target_words = target.split()
+
+    if all(any(qw in tw for tw in target_words) for qw in query_words):
+        return 80.0
+
+    # Token-based matching
+    matching_words = sum(
+        1 for qw in query_words if any(qw in tw or tw in qw for tw in target_words)
+    )
+    if query_words:
+        word_score = (matching_words / len(query_words)) * 70
+        if word_score > 30:
+            return word_score
+
+    # Character-level similarity (Levenshtein-like approach)
+    # Calculate common characters ratio
+    query_chars = set(query.replace(" ", ""))
+    target_chars = set(target.replace(" ", ""))
+
+    if query_chars and target_chars:
+        common = len(query_chars.intersection(target_chars))
+        total = len(query_chars.union(target_chars))
+        char_score = (common / total) * 50
+
+        # Boost if first character matches
+        if query[0] == target[0]:
+            char_score += 10
+
+        return char_score
+
+    return 0.0
+
 
 class Block:
     """Represents a single block in the property blockchain."""
 
+    # No per-instance __dict__: a loaded chain holds one Block per transaction
+    __slots__ = ("index", "timestamp", "data", "previous_hash", "property_key", "hash")
+
     def __init__(
         self,
         index: int,
@@ -51,26 +195,70 @@ class Block:
 
     def calculate_hash(self) -> str:
         """Calculate SHA-256 hash of the block with deterministic JSON serialization."""
-        block_string = json.dumps(
+        # The five top-level keys are fixed, so they are written out in sorted
+        # order and only "data" goes through the encoder - same bytes as
+        # _canonical_dict_json(). Other field types (a tampered stored block)
+        # take the encoder path so they still hash exactly as before.
+        try:
+            if self.index.__class__ is not int:
+                raise TypeError
+            block_string = (
+                '{"data":'
+                + _canonical_json(self.data)
+                + ',"index":'
+                + int.__repr__(self.index)
+                + ',"previous_hash":'
+                + _canonical_str(self.previous_hash)
+                + ',"property_key":'
+                + _canonical_str(self.property_key)
+                + ',"timestamp":'
+                + _canonical_str(self.timestamp)
+                + "}"
+            )
+        except TypeError:
+            block_string = self._canonical_dict_json()
+        # ensure_ascii output is pure ASCII, so the cheaper ASCII codec applies
+        return _sha256(block_string.encode("ascii")).hexdigest()
+
+    def _canonical_dict_json(self) -> str:
+        """Canonical JSON of the block via the encoder, for any field types."""
+        return _canonical_json(
             {
                 "index": self.index,
                 "timestamp": self.timestamp,
                 "data": self.data,
                 "previous_hash": self.previous_hash,
                 "property_key": self.property_key,
-            },
-            sort_keys=True,
-            separators=(",", ":"),
-            ensure_ascii=True,
+            }
         )
-        return hashlib.sha256(block_string.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_dict(cls, block_dict: Dict[str, Any]) -> "Block":
+        """
+        Rebuild a stored block, keeping its stored hash.
+        Skips calculate_hash() - loaders validate the chain afterwards anyway.
+        """
+        block = cls.__new__(cls)
+        block.index = block_dict["index"]
+        block.timestamp = block_dict["timestamp"]
+        block.data = block_dict["data"]
+        block.previous_hash = block_dict["previous_hash"]
+        block.property_key = block_dict["property_key"]
+        block.hash = block_dict["hash"]
+        return block
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert block to dictionary representation with deep copy to prevent mutation."""
+        """
+        Convert block to dictionary representation.
+
+        "data" is the block's own dict, not a copy - every caller only reads
+        or serializes it. Copy it first if you need to change anything
+        (see the property history view).
+        """
         return {
             "index": self.index,
             "timestamp": self.timestamp,
-            "data": copy.deepcopy(self.data),
+            "data": self.data,
             "previous_hash": self.previous_hash,
             "property_key": self.property_key,
             "hash": self.hash,
@@ -88,20 +276,32 @@ class PropertyBlockchain:
     PINATA_API_KEY = os.environ.get("PINATA_API_KEY")
     PINATA_SECRET_KEY = os.environ.get("PINATA_SECRET_KEY")
 
-    def __init__(self, verbose: bool = False, auto_restore: bool = False):
+    # Shared across instances so a restored blockchain never reuses a version
+    # number that a cache may still hold for the instance it replaced
+    _version_counter = itertools.count(1)
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        auto_restore: bool = False,
+        load_existing: bool = True,
+    ):
         """
         Initialize PropertyBlockchain.
 
         Args:
             verbose: Enable console logging (default: False for production)
             auto_restore: Enable automatic restore from database backup if no local blockchain exists
+            load_existing: Look for an existing blockchain (IPFS, encrypted file) before
+                creating the genesis block. Pass False when the caller loads data itself.
         """
         self.verbose = verbose
         self.chain: List[Block] = []
         self.property_index: Dict[
             str, List[int]
         ] = {}  # Maps property_key to block indices
-        self.logs: List[str] = []  # Store recent log messages for debugging
+        # Store recent log messages for debugging (oldest dropped past 50)
+        self.logs: Deque[str] = deque(maxlen=50)
 
         # Identity registry to ensure Aadhar and PAN uniqueness
         # Format: {"owner_name": {"aadhar": "123456789012", "pan": "ABCDE1234F", "customer_key": "CUST-XXXX"}}
@@ -115,9 +315,26 @@ class PropertyBlockchain:
         self.survey_to_property: Dict[
             str, str
         ] = {}  # Maps survey_no -> property_key (ensures uniqueness)
-
+        # Reverse index of current owners: (customer_key, pan, aadhar) -> property keys
+        self._by_owner: Dict[Tuple[str, str, str], List[str]] = defaultdict(list)
+        # Reverse index of current owner names: owner.lower() -> property keys
+        self._by_owner_name: Dict[str, List[str]] = defaultdict(list)
+        # (last_updated, property_key) pairs kept sorted so listings can be paged
+        self._properties_by_last_updated: List[Tuple[str, str]] = []
+        # property_key -> (block count, current state); a new block for the
+        # property changes the count, so stale entries are never returned
+        self._state_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        # Same keying, for unified_search's pre-lowered field values
+        self._search_fields_cache: Dict[str, Tuple[int, Optional[List[tuple]]]] = {}
+        # Bumped on every mutation so callers can cache derived views per version
+        self._version = next(self._version_counter)
+        # mtime of STORAGE_FILE as last written or read by this instance
+        self._storage_mtime_ns: Optional[int] = None
+
+        if not load_existing:
+            self._create_genesis_block()
         # Priority 1: Try to restore from database backup (fastest and most reliable)
-        if auto_restore and self._auto_restore_from_database():
+        elif auto_restore and self._auto_restore_from_database():
             self._log("Successfully auto-restored blockchain from database")
         # Priority 2: Try to restore from Pinata IPFS CID if available
         elif self._auto_restore_from_ipfs():
@@ -130,13 +347,20 @@ class PropertyBlockchain:
             self._create_genesis_block()
             self._log("Created new blockchain with genesis block")
 
+    @classmethod
+    def from_storage_file(cls, verbose: bool = False) -> Optional["PropertyBlockchain"]:
+        """Load a blockchain from STORAGE_FILE only (no database or IPFS lookups)."""
+        blockchain = cls(verbose=verbose, load_existing=False)
+        return blockchain if blockchain._load_blockchain() else None
+
     def _log(self, message: str, level: str = "info") -> None:
         """Internal logging method (only logs if verbose=True)."""
         # Always store logs for debugging
-        self.logs.append(f"[{level.upper()}] {message}")
-        # Keep only last 50 logs
-        if len(self.logs) > 50:
-            self.logs = self.logs[-50:]
+        entry = f"[{level.upper()}] {message}"
+        self.logs.append(entry)
+        captured = getattr(_log_capture, "messages", None)
+        if captured is not None:
+            captured.append(entry)
 
         if self.verbose:
             if level == "error":
@@ -144,6 +368,82 @@ class PropertyBlockchain:
             else:
                 logger.info(message)
 
+    @staticmethod
+    @contextmanager
+    def capture_logs() -> Iterator[List[str]]:
+        """
+        Collect the messages this thread logs inside the block.
+        Background jobs use this instead of reading the shared `logs`, which
+        request threads write to concurrently.
+        """
+        previous = getattr(_log_capture, "messages", None)
+        messages: List[str] = []
+        _log_capture.messages = messages
+        try:
+            yield messages
+        finally:
+            _log_capture.messages = previous
+
+    def recent_logs(self, count: int = 10) -> List[str]:
+        """Return the last `count` log messages, oldest first."""
+        return list(itertools.islice(self.logs, max(len(self.logs) - count, 0), None))
+
+    def _mark_changed(self) -> None:
+        """Bump the chain version, invalidating any caches keyed on it."""
+        self._version = next(self._version_counter)
+
+    @staticmethod
+    def _owner_key(state: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Build the _by_owner index key from a property's current state."""
+        return (
+            state.get("customer_key", ""),
+            state.get("pan_no", ""),
+            state.get("aadhar_no", ""),
+        )
+
+    @staticmethod
+    def _move_owner_entry(
+        index: Dict[Any, List[str]], old_key: Any, new_key: Any, property_key: str
+    ) -> None:
+        """Move property_key from old_key's list to new_key's in a reverse index."""
+        owned = index.get(old_key)
+        if owned and property_key in owned:
+            owned.remove(property_key)
+            if not owned:
+                del index[old_key]
+        index[new_key].append(property_key)
+
+    def _rebuild_owner_index(self) -> None:
+        """Rebuild the current-owner and last-updated indexes from the chain (after a load)."""
+        self._state_cache = {}
+        self._search_fields_cache = {}
+        self._by_owner = defaultdict(list)
+        self._by_owner_name = defaultdict(list)
+        by_last_updated = []
+        for property_key in self.property_index:
+            if property_key == "GENESIS":
+                continue
+            try:
+                state = self.get_property_current_state(property_key)
+            except Exception:
+                continue
+            self._by_owner[self._owner_key(state)].append(property_key)
+            self._by_owner_name[state["owner"].lower()].append(property_key)
+            by_last_updated.append((state["last_updated"], property_key))
+        by_last_updated.sort()
+        self._properties_by_last_updated = by_last_updated
+
+    def _touch_last_updated(
+        self, property_key: str, old_timestamp: Optional[str], new_timestamp: str
+    ) -> None:
+        """Move a property to its new position in the last-updated ordering."""
+        entries = self._properties_by_last_updated
+        if old_timestamp is not None:
+            i = bisect.bisect_left(entries, (old_timestamp, property_key))
+            if i < len(entries) and entries[i] == (old_timestamp, property_key):
+                del entries[i]
+        bisect.insort(entries, (new_timestamp, property_key))
+
     def _create_genesis_block(self) -> None:
         """Create the first block in the chain."""
         genesis_block = Block(
@@ -161,84 +461,26 @@ class PropertyBlockchain:
 
     def validate_aadhar(self, aadhar: str) -> bool:
         """Validate Aadhar number format (12 digits)."""
-        aadhar_clean = aadhar.replace(" ", "").replace("-", "")
+        aadhar_clean = aadhar.translate(_AADHAR_STRIP)
         return len(aadhar_clean) == 12 and aadhar_clean.isdigit()
 
     def validate_pan(self, pan: str) -> bool:
         """Validate PAN card format (10 alphanumeric characters)."""
-        import re
-
-        pan_pattern = r"^[A-Z]{5}[0-9]{4}[A-Z]{1}$"
-        return bool(re.match(pan_pattern, pan.upper()))
-
-    def validate_aadhar_uniqueness(self, owner: str, aadhar: str) -> None:
-        """Validate Aadhar uniqueness immediately upon entry.
-
-        Raises:
-            ValueError: If Aadhar is already used by someone else or owner has different Aadhar registered
-        """
-        aadhar_clean = aadhar.replace(" ", "").replace("-", "")
-        owner_normalized = owner.strip()
-
-        # Check if this owner already has a registered Aadhar
-        if owner_normalized in self.identity_registry:
-            registered_aadhar = self.identity_registry[owner_normalized]["aadhar"]
-            if registered_aadhar != aadhar_clean:
-                raise ValueError(
-                    f"Identity mismatch: Owner '{owner_normalized}' is already registered "
-                    f"with Aadhar {registered_aadhar}. Same person cannot have multiple Aadhar numbers."
-                )
-
-        # Check if this Aadhar is already used by someone else
-        if aadhar_clean in self.aadhar_to_owner:
-            existing_owner = self.aadhar_to_owner[aadhar_clean]
-            if existing_owner != owner_normalized:
-                raise ValueError(
-                    f"Aadhar number {aadhar_clean} is already registered to '{existing_owner}'. "
-                    f"Each Aadhar must be unique."
-                )
-
-    def validate_pan_uniqueness(self, owner: str, pan: str) -> None:
-        """Validate PAN uniqueness immediately upon entry.
-
-        Raises:
-            ValueError: If PAN is already used by someone else or owner has different PAN registered
-        """
-        pan_clean = pan.upper()
-        owner_normalized = owner.strip()
-
-        # Check if this owner already has a registered PAN
-        if owner_normalized in self.identity_registry:
-            registered_pan = self.identity_registry[owner_normalized]["pan"]
-            if registered_pan != pan_clean:
-                raise ValueError(
-                    f"Identity mismatch: Owner '{owner_normalized}' is already registered "
-                    f"with PAN {registered_pan}. Same person cannot have multiple PAN numbers."
-                )
-
-        # Check if this PAN is already used by someone else
-        if pan_clean in self.pan_to_owner:
-            existing_owner = self.pan_to_owner[pan_clean]
-            if existing_owner != owner_normalized:
-                raise ValueError(
-                    f"PAN number {pan_clean} is already registered to '{existing_owner}'. "
-                    f"Each PAN must be unique."
-                )
+        return _PAN_RE.match(pan.upper()) is not None
 
     def _generate_customer_key(self) -> str:
         """Generate a unique customer key for an owner.
 
         Returns:
-            Unique customer key in format CUST-XXXXXXXX
+            Unique customer key in format CUST-XXXXXXXXXXXXXXXX
         """
-        # Generate a unique key using UUID and take first 8 characters
-        unique_id = str(uuid.uuid4()).upper().replace("-", "")[:8]
-        customer_key = f"CUST-{unique_id}"
+        # 16 random hex characters (64 bits) - with 32 bits, collisions become
+        # likely around 65k owners. Older 8-character keys stay valid.
+        customer_key = f"CUST-{secrets.token_hex(8).upper()}"
 
-        # Ensure it's unique (extremely unlikely to collide, but be safe)
+        # Ensure it's unique (unlikely to collide, but be safe)
         while customer_key in self.customer_key_to_owner:
-            unique_id = str(uuid.uuid4()).upper().replace("-", "")[:8]
-            customer_key = f"CUST-{unique_id}"
+            customer_key = f"CUST-{secrets.token_hex(8).upper()}"
 
         return customer_key
 
@@ -256,8 +498,8 @@ class PropertyBlockchain:
         """
         survey_clean = survey_no.strip()
 
-        if survey_clean in self.survey_to_property:
-            existing_property = self.survey_to_property[survey_clean]
+        existing_property = self.survey_to_property.get(survey_clean)
+        if existing_property is not None:
             # Allow if it's the same property (shouldn't happen in add, but good for future)
             if property_key is None or existing_property != property_key:
                 raise ValueError(
@@ -280,15 +522,16 @@ class PropertyBlockchain:
             ValueError: If there's an identity conflict
         """
         # Clean and normalize
-        aadhar_clean = aadhar.replace(" ", "").replace("-", "")
+        aadhar_clean = aadhar.translate(_AADHAR_STRIP)
         pan_clean = pan.upper()
         owner_normalized = owner.strip()
 
         # Check if this owner already exists in registry
-        if owner_normalized in self.identity_registry:
+        registered = self.identity_registry.get(owner_normalized)
+        if registered is not None:
             # Verify the Aadhar and PAN match
-            registered_aadhar = self.identity_registry[owner_normalized]["aadhar"]
-            registered_pan = self.identity_registry[owner_normalized]["pan"]
+            registered_aadhar = registered["aadhar"]
+            registered_pan = registered["pan"]
 
             if registered_aadhar != aadhar_clean:
                 raise ValueError(
@@ -308,24 +551,22 @@ class PropertyBlockchain:
             return True
 
         # Check if this Aadhar is already used by someone else
-        if aadhar_clean in self.aadhar_to_owner:
-            existing_owner = self.aadhar_to_owner[aadhar_clean]
-            if existing_owner != owner_normalized:
-                raise ValueError(
-                    f"Aadhar number {aadhar_clean} is already registered to '{existing_owner}'. "
-                    f"Cannot register same Aadhar to '{owner_normalized}'. "
-                    "Each Aadhar must be unique."
-                )
+        existing_owner = self.aadhar_to_owner.get(aadhar_clean)
+        if existing_owner is not None and existing_owner != owner_normalized:
+            raise ValueError(
+                f"Aadhar number {aadhar_clean} is already registered to '{existing_owner}'. "
+                f"Cannot register same Aadhar to '{owner_normalized}'. "
+                "Each Aadhar must be unique."
+            )
 
         # Check if this PAN is already used by someone else
-        if pan_clean in self.pan_to_owner:
-            existing_owner = self.pan_to_owner[pan_clean]
-            if existing_owner != owner_normalized:
-                raise ValueError(
-                    f"PAN number {pan_clean} is already registered to '{existing_owner}'. "
-                    f"Cannot register same PAN to '{owner_normalized}'. "
-                    "Each PAN must be unique."
-                )
+        existing_owner = self.pan_to_owner.get(pan_clean)
+        if existing_owner is not None and existing_owner != owner_normalized:
+            raise ValueError(
+                f"PAN number {pan_clean} is already registered to '{existing_owner}'. "
+                f"Cannot register same PAN to '{owner_normalized}'. "
+                "Each PAN must be unique."
+            )
 
         # New owner - register them with a unique customer key
         customer_key = self._generate_customer_key()
@@ -353,12 +594,12 @@ class PropertyBlockchain:
         Returns:
             Dictionary with owner information or None if not found
         """
-        if customer_key in self.customer_key_to_owner:
-            owner_name = self.customer_key_to_owner[customer_key]
-            owner_info = self.identity_registry[owner_name].copy()
-            owner_info["name"] = owner_name
-            return owner_info
-        return None
+        owner_name = self.customer_key_to_owner.get(customer_key)
+        if owner_name is None:
+            return None
+        owner_info = self.identity_registry[owner_name].copy()
+        owner_info["name"] = owner_name
+        return owner_info
 
     def add_property(
         self,
@@ -420,21 +661,22 @@ class PropertyBlockchain:
             raise ValueError("Invalid PAN number. Must be in format: ABCDE1234F")
 
         # Register or validate owner identity (ensures Aadhar and PAN uniqueness)
-        self.register_or_validate_identity(owner, aadhar_no, pan_no)
+        owner_normalized = owner.strip()
+        self.register_or_validate_identity(owner_normalized, aadhar_no, pan_no)
 
         # Validate and register survey number uniqueness
         self.validate_survey_uniqueness(survey_no)
 
-        # Get customer key for the owner
-        owner_normalized = owner.strip()
-        customer_key = self.identity_registry[owner_normalized]["customer_key"]
+        # The registry entry holds the customer key and the cleaned Aadhar/PAN
+        identity = self.identity_registry[owner_normalized]
+        customer_key = identity["customer_key"]
 
         data = {
             "type": "registration",
             "owner": owner,
             "customer_key": customer_key,
-            "aadhar_no": aadhar_no.replace(" ", "").replace("-", ""),
-            "pan_no": pan_no.upper(),
+            "aadhar_no": identity["aadhar"],
+            "pan_no": identity["pan"],
             "address": address,
             "pincode": pincode,
             "value": value,
@@ -464,6 +706,12 @@ class PropertyBlockchain:
 
         # Register survey number to property mapping
         self.survey_to_property[survey_no.strip()] = property_key
+        self._by_owner[(customer_key, data["pan_no"], data["aadhar_no"])].append(
+            property_key
+        )
+        self._by_owner_name[owner.lower()].append(property_key)
+        self._touch_last_updated(property_key, None, new_block.timestamp)
+        self._mark_changed()
 
         self._log(f"Property '{property_key}' registered successfully")
         return new_block
@@ -511,24 +759,25 @@ class PropertyBlockchain:
             )
 
         # Register or validate new owner identity (ensures Aadhar and PAN uniqueness)
-        self.register_or_validate_identity(new_owner, new_owner_aadhar, new_owner_pan)
+        new_owner_normalized = new_owner.strip()
+        self.register_or_validate_identity(
+            new_owner_normalized, new_owner_aadhar, new_owner_pan
+        )
 
         # Get current property state
         current_state = self.get_property_current_state(property_key)
         previous_owner = current_state["owner"]
 
         # Prevent self-transfer: owner cannot sell property to themselves
-        if previous_owner.strip().lower() == new_owner.strip().lower():
+        if previous_owner.strip().lower() == new_owner_normalized.lower():
             raise ValueError(
                 f"Cannot transfer property to the same owner. "
                 f"'{previous_owner}' already owns this property."
             )
 
-        # Get customer keys
-        new_owner_normalized = new_owner.strip()
-        new_owner_customer_key = self.identity_registry[new_owner_normalized][
-            "customer_key"
-        ]
+        # The registry entry holds the customer key and the cleaned Aadhar/PAN
+        new_owner_identity = self.identity_registry[new_owner_normalized]
+        new_owner_customer_key = new_owner_identity["customer_key"]
 
         # Determine actual transfer value
         actual_transfer_value = transfer_value or current_state.get("value")
@@ -550,8 +799,8 @@ class PropertyBlockchain:
             "previous_customer_key": current_state.get("customer_key", ""),
             "new_owner": new_owner,
             "new_owner_customer_key": new_owner_customer_key,
-            "new_owner_aadhar": new_owner_aadhar.replace(" ", "").replace("-", ""),
-            "new_owner_pan": new_owner_pan.upper(),
+            "new_owner_aadhar": new_owner_identity["aadhar"],
+            "new_owner_pan": new_owner_identity["pan"],
             "transfer_value": actual_transfer_value,
             "new_property_value": new_property_value,
             "address": current_state["address"],
@@ -574,6 +823,21 @@ class PropertyBlockchain:
         self.chain.append(new_block)
         self.property_index[property_key].append(new_block.index)
 
+        # Move the property to the new owner in the reverse indexes
+        self._move_owner_entry(
+            self._by_owner,
+            self._owner_key(current_state),
+            (new_owner_customer_key, data["new_owner_pan"], data["new_owner_aadhar"]),
+            property_key,
+        )
+        self._move_owner_entry(
+            self._by_owner_name, previous_owner.lower(), new_owner.lower(), property_key
+        )
+        self._touch_last_updated(
+            property_key, current_state["last_updated"], new_block.timestamp
+        )
+        self._mark_changed()
+
         self._log(
             f"Property '{property_key}' transferred from '{previous_owner}' to '{new_owner}' ({transfer_reason})"
         )
@@ -665,18 +929,20 @@ class PropertyBlockchain:
         Returns:
             Current property details including owner, address, value
         """
-        if property_key not in self.property_index:
+        block_indices = self.property_index.get(property_key)
+        if block_indices is None:
             raise ValueError(f"Property with key '{property_key}' not found.")
 
-        # Get the latest block for this property
-        latest_index = self.property_index[property_key][-1]
-        latest_block = self.chain[latest_index]
+        cached = self._state_cache.get(property_key)
+        if cached is not None and cached[0] == len(block_indices):
+            return dict(cached[1])
 
-        # Build current state from history
-        history = self.get_property_history(property_key)
+        # Only the registration block and the latest block matter here
+        first_block = self.chain[block_indices[0]]
+        latest_block = self.chain[block_indices[-1]]
 
         # Start with registration data
-        registration = history[0]["data"]
+        registration = first_block.data
         location = registration.get("location", {})
         land_details = registration.get("land_details", {})
 
@@ -700,14 +966,14 @@ class PropertyBlockchain:
             "land_area": land_details.get("area", ""),
             "land_type": land_details.get("type", ""),
             "description": registration.get("description", ""),
-            "registered_at": history[0]["timestamp"],
+            "registered_at": first_block.timestamp,
             "last_updated": latest_block.timestamp,
-            "total_transfers": len(history) - 1,
+            "total_transfers": len(block_indices) - 1,
         }
 
         # Update with latest transfer info if any
-        if len(history) > 1:
-            latest_data = history[-1]["data"]
+        if len(block_indices) > 1:
+            latest_data = latest_block.data
             current_state["owner"] = latest_data["new_owner"]
             current_state["customer_key"] = latest_data.get(
                 "new_owner_customer_key", ""
@@ -718,7 +984,8 @@ class PropertyBlockchain:
             if latest_data.get("new_property_value"):
                 current_state["value"] = latest_data["new_property_value"]
 
-        return current_state
+        self._state_cache[property_key] = (len(block_indices), current_state)
+        return dict(current_state)
 
     def get_property(self, property_key: str) -> Optional[Dict[str, Any]]:
         """
@@ -761,6 +1028,7 @@ class PropertyBlockchain:
     def search_by_owner(self, owner: str) -> List[Dict[str, Any]]:
         """
         Find all properties currently owned by a specific owner (exact match).
+        Uses the owner-name reverse index instead of scanning every property.
 
         Args:
             owner: Owner's name/ID to search for
@@ -769,12 +1037,10 @@ class PropertyBlockchain:
             List of property current states
         """
         results = []
-        for property_key in self.property_index:
+        for property_key in self._by_owner_name.get(owner.lower(), ()):
             try:
-                state = self.get_property_current_state(property_key)
-                if state["owner"].lower() == owner.lower():
-                    results.append(state)
-            except:
+                results.append(self.get_property_current_state(property_key))
+            except ValueError:
                 continue
         return results
 
@@ -783,18 +1049,14 @@ class PropertyBlockchain:
     ) -> List[Dict[str, Any]]:
         """
         Find properties matching owner's Customer Key, PAN, and Aadhaar.
+        Uses the current-owner reverse index instead of scanning the chain.
         """
+        key = (customer_key, pan.upper(), aadhar.translate(_AADHAR_STRIP))
         results = []
-        for property_key in self.property_index:
+        for property_key in self._by_owner.get(key, ()):
             try:
-                state = self.get_property_current_state(property_key)
-                if (
-                    state["customer_key"] == customer_key
-                    and state["pan_no"] == pan.upper()
-                    and state["aadhar_no"] == aadhar.replace(" ", "").replace("-", "")
-                ):
-                    results.append(state)
-            except:
+                results.append(self.get_property_current_state(property_key))
+            except ValueError:
                 continue
         return results
 
@@ -810,57 +1072,41 @@ class PropertyBlockchain:
         Returns:
             Float score between 0 and 100 (higher = better match)
         """
-        query = query.lower().strip()
-        target = target.lower().strip()
-
-        if not query or not target:
-            return 0.0
+        return _fuzzy_score(query, target)
 
-        # Exact match
-        if query == target:
-            return 100.0
-
-        # Query is a substring of target (partial match)
-        if query in target:
-            return 90.0 + (len(query) / len(target)) * 10
-
-        # Target starts with query
-        if target.startswith(query):
-            return 85.0 + (len(query) / len(target)) * 10
-
-        # Target contains all words from query
-        query_words = query.split()
-        target_words = target.split()
-
-        if all(any(qw in tw for tw in target_words) for qw in query_words):
-            return 80.0
-
-        # Token-based matching
-        matching_words = sum(
-            1 for qw in query_words if any(qw in tw or tw in qw for tw in target_words)
-        )
-        if query_words:
-            word_score = (matching_words / len(query_words)) * 70
-            if word_score > 30:
-                return word_score
-
-        # Character-level similarity (Levenshtein-like approach)
-        # Calculate common characters ratio
-        query_chars = set(query.replace(" ", ""))
-        target_chars = set(target.replace(" ", ""))
-
-        if query_chars and target_chars:
-            common = len(query_chars.intersection(target_chars))
-            total = len(query_chars.union(target_chars))
-            char_score = (common / total) * 50
-
-            # Boost if first character matches
-            if query[0] == target[0]:
-                char_score += 10
+    def _search_fields(
+        self, property_key: str, state: Dict[str, Any]
+    ) -> Optional[List[Tuple[str, float, bool, bool, str, str]]]:
+        """
+        unified_search's per-property field list: (name, weight, normalize,
+        fuzzy, value, lower-cased/normalized value) for each non-empty
+        searchable field. Built once per property state and cached like
+        _state_cache; None if a field value isn't a string (never matched).
+        """
+        block_count = len(self.property_index[property_key])
+        cached = self._search_fields_cache.get(property_key)
+        if cached is not None and cached[0] == block_count:
+            return cached[1]
 
-            return char_score
+        fields = []
+        try:
+            for field_name, weight, normalize, fuzzy in _SEARCH_FIELDS:
+                field_value = state.get(field_name, "")
+                if not field_value:
+                    continue
+                # Normalize if needed (for aadhar)
+                if normalize:
+                    field_value_clean = field_value.translate(_AADHAR_STRIP).lower()
+                else:
+                    field_value_clean = field_value.lower()
+                fields.append(
+                    (field_name, weight, normalize, fuzzy, field_value, field_value_clean)
+                )
+        except AttributeError:
+            fields = None
 
-        return 0.0
+        self._search_fields_cache[property_key] = (block_count, fields)
+        return fields
 
     def unified_search(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -881,7 +1127,7 @@ class PropertyBlockchain:
             return results
 
         # Normalize query for identity document searches (remove spaces/dashes)
-        query_normalized = search_query.replace(" ", "").replace("-", "")
+        query_normalized = search_query.translate(_AADHAR_STRIP)
 
         for property_key in self.property_index:
             if property_key == "GENESIS":
@@ -889,123 +1135,57 @@ class PropertyBlockchain:
 
             try:
                 state = self.get_property_current_state(property_key)
-                best_score = 0.0
-                matched_field = ""
-
-                # Define searchable fields with their weights
-                searchable_fields = {
-                    "property_key": {
-                        "value": state.get("property_key", ""),
-                        "weight": 1.0,
-                        "normalize": False,
-                    },
-                    "owner": {
-                        "value": state.get("owner", ""),
-                        "weight": 1.0,
-                        "normalize": False,
-                        "fuzzy": True,
-                    },
-                    "customer_key": {
-                        "value": state.get("customer_key", ""),
-                        "weight": 0.95,
-                        "normalize": False,
-                    },
-                    "survey_no": {
-                        "value": state.get("survey_no", ""),
-                        "weight": 0.9,
-                        "normalize": False,
-                    },
-                    "rtc_no": {
-                        "value": state.get("rtc_no", ""),
-                        "weight": 0.9,
-                        "normalize": False,
-                    },
-                    "aadhar_no": {
-                        "value": state.get("aadhar_no", ""),
-                        "weight": 0.85,
-                        "normalize": True,
-                    },
-                    "pan_no": {
-                        "value": state.get("pan_no", ""),
-                        "weight": 0.85,
-                        "normalize": False,
-                    },
-                    "village": {
-                        "value": state.get("village", ""),
-                        "weight": 0.7,
-                        "normalize": False,
-                    },
-                    "district": {
-                        "value": state.get("district", ""),
-                        "weight": 0.7,
-                        "normalize": False,
-                    },
-                    "taluk": {
-                        "value": state.get("taluk", ""),
-                        "weight": 0.7,
-                        "normalize": False,
-                    },
-                    "pincode": {
-                        "value": state.get("pincode", ""),
-                        "weight": 0.8,
-                        "normalize": False,
-                    },
-                    "address": {
-                        "value": state.get("address", ""),
-                        "weight": 0.6,
-                        "normalize": False,
-                    },
-                }
-
-                for field_name, field_config in searchable_fields.items():
-                    field_value = field_config["value"]
-                    if not field_value:
-                        continue
-
-                    # Normalize if needed (for aadhar)
-                    if field_config.get("normalize"):
-                        field_value_clean = (
-                            field_value.replace(" ", "").replace("-", "").lower()
-                        )
-                        compare_query = query_normalized
-                    else:
-                        field_value_clean = field_value.lower()
-                        compare_query = search_query
-
-                    score = 0.0
-
-                    # Exact match
-                    if compare_query == field_value_clean:
-                        score = 100.0
-                    # Starts with query
-                    elif field_value_clean.startswith(compare_query):
-                        score = (
-                            90.0 + (len(compare_query) / len(field_value_clean)) * 10
-                        )
-                    # Contains query
-                    elif compare_query in field_value_clean:
-                        score = (
-                            75.0 + (len(compare_query) / len(field_value_clean)) * 15
-                        )
-                    # Use fuzzy matching for owner name
-                    elif field_config.get("fuzzy"):
-                        score = self._calculate_fuzzy_score(search_query, field_value)
-
-                    # Apply field weight
-                    weighted_score = score * field_config["weight"]
-
-                    if weighted_score > best_score:
-                        best_score = weighted_score
-                        matched_field = field_name
-
-                # Include if score is above threshold
-                if best_score >= 35.0:
-                    state["_match_score"] = round(best_score, 1)
-                    state["_matched_field"] = matched_field
-                    results.append(state)
-
+                fields = self._search_fields(property_key, state)
             except Exception:
                 continue
+            if fields is None:
+                continue
+
+            best_score = 0.0
+            matched_field = ""
+
+            for (
+                field_name,
+                weight,
+                normalize,
+                fuzzy,
+                field_value,
+                field_value_clean,
+            ) in fields:
+                compare_query = query_normalized if normalize else search_query
+
+                score = 0.0
+
+                # Exact match
+                if compare_query == field_value_clean:
+                    score = 100.0
+                # Starts with query
+                elif field_value_clean.startswith(compare_query):
+                    score = 90.0 + (len(compare_query) / len(field_value_clean)) * 10
+                # Contains query
+                elif compare_query in field_value_clean:
+                    score = 75.0 + (len(compare_query) / len(field_value_clean)) * 15
+                # Use fuzzy matching for owner name. With no substring
+                # match it scores at most 80, so skip it when that
+                # cannot beat the best field so far.
+                elif fuzzy and 80.0 * weight > best_score:
+                    score = self._calculate_fuzzy_score(search_query, field_value)
+
+                # Apply field weight
+                weighted_score = score * weight
+
+                if weighted_score > best_score:
+                    best_score = weighted_score
+                    matched_field = field_name
+                    # No field can score above 100 (weight 1.0 exact match)
+                    if best_score >= 100.0:
+                        break
+
+            # Include if score is above threshold
+            if best_score >= 35.0:
+                state["_match_score"] = round(best_score, 1)
+                state["_matched_field"] = matched_field
+                results.append(state)
 
         # Sort by match score (highest first)
         results.sort(key=lambda x: x.get("_match_score", 0), reverse=True)
@@ -1026,6 +1206,9 @@ class PropertyBlockchain:
             self._log("Blockchain is valid (genesis only)")
             return True
 
+        # Check every block after genesis in the calling thread - a process
+        # pool costs more to start than the hashing takes, and forking from a
+        # threaded gunicorn worker is not safe
         for i in range(1, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
@@ -1070,13 +1253,13 @@ class PropertyBlockchain:
         Returns tuple of (is_valid, summary_message, detailed_logs).
         """
         # Clear previous logs
-        self.logs = []
+        self.logs.clear()
 
         is_valid = self.is_chain_valid()
         summary = "Blockchain is valid" if is_valid else "Blockchain validation failed"
 
         # Return validation result, summary, and recent logs
-        return is_valid, summary, self.logs[-10:]  # Last 10 log messages
+        return is_valid, summary, self.recent_logs(10)  # Last 10 log messages
 
     def get_all_properties(self) -> List[Dict[str, Any]]:
         """Get current state of all registered properties."""
@@ -1086,11 +1269,31 @@ class PropertyBlockchain:
             if key != "GENESIS"
         ]
 
+    def get_properties_page(self, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get current state of a page of properties, most recently updated first.
+
+        Args:
+            offset: Number of properties to skip
+            limit: Maximum number of properties to return
+        """
+        entries = self._properties_by_last_updated
+        end = max(len(entries) - offset, 0)
+        start = max(end - limit, 0)
+        return [
+            self.get_property_current_state(property_key)
+            for _, property_key in reversed(entries[start:end])
+        ]
+
+    def get_property_count(self) -> int:
+        """Number of registered properties (excluding genesis)."""
+        return len(self._properties_by_last_updated)
+
     def get_chain_info(self) -> Dict:
         """Get blockchain statistics."""
         return {
             "total_blocks": len(self.chain),
-            "total_properties": len([k for k in self.property_index if k != "GENESIS"]),
+            "total_properties": self.get_property_count(),
             "latest_hash": self.get_latest_block().hash,
         }
 
@@ -1112,33 +1315,30 @@ class PropertyBlockchain:
 
     def _encrypt_data(self, data: str) -> str:
         """Encrypt data using SHA-256 based encryption with base64 encoding."""
-        # Create a key from the data itself (deterministic but obfuscated)
-        key = hashlib.sha256(b"pawperty_blockchain_key").digest()
+        return "".join(self._encrypt_chunks(data))
 
-        # XOR encryption with the key (repeating key as needed)
-        encrypted_bytes = bytearray()
-        data_bytes = data.encode("utf-8")
-
-        for i, byte in enumerate(data_bytes):
-            encrypted_bytes.append(byte ^ key[i % len(key)])
-
-        # Encode as base64 for safe storage
-        return base64.b64encode(encrypted_bytes).decode("utf-8")
+    def _encrypt_chunks(self, data: str) -> Iterator[str]:
+        """
+        _encrypt_data() output in consecutive pieces. Each piece covers
+        _STORAGE_CHUNK bytes, a multiple of both the key length and base64's
+        3-byte groups, so the pieces join into exactly the single-shot text.
+        """
+        data_bytes = memoryview(data.encode("utf-8"))
+        for start in range(0, len(data_bytes), _STORAGE_CHUNK):
+            # XOR encryption with the key (repeating key as needed)
+            encrypted_bytes = _xor_with_storage_key(
+                data_bytes[start : start + _STORAGE_CHUNK]
+            )
+            # Encode as base64 for safe storage (binascii is what base64 wraps)
+            yield binascii.b2a_base64(encrypted_bytes, newline=False).decode("ascii")
 
     def _decrypt_data(self, encrypted_data: str) -> str:
         """Decrypt data that was encrypted with _encrypt_data."""
-        # Create the same key
-        key = hashlib.sha256(b"pawperty_blockchain_key").digest()
-
         # Decode from base64
-        encrypted_bytes = base64.b64decode(encrypted_data.encode("utf-8"))
-
-        # XOR decryption with the key
-        decrypted_bytes = bytearray()
-        for i, byte in enumerate(encrypted_bytes):
-            decrypted_bytes.append(byte ^ key[i % len(key)])
+        encrypted_bytes = binascii.a2b_base64(encrypted_data.encode("utf-8"))
 
-        return decrypted_bytes.decode("utf-8")
+        # XOR decryption with the same key
+        return _xor_with_storage_key(encrypted_bytes).decode("utf-8")
 
     def _save_blockchain(self) -> bool:
         """Save blockchain to an encrypted JSON file."""
@@ -1159,14 +1359,13 @@ class PropertyBlockchain:
                 "saved_at": datetime.now().isoformat(),
             }
 
-            # Convert to JSON string
-            json_data = json.dumps(blockchain_data, indent=2)
+            # Convert to compact JSON - the file is encrypted, so indentation
+            # would only add bytes to XOR, encode and upload
+            json_data = json.dumps(blockchain_data, separators=(",", ":"))
 
-            # Encrypt the data
-            encrypted_data = self._encrypt_data(json_data)
-
-            # Remove read-only attribute before writing (Windows)
-            if os.path.exists(self.STORAGE_FILE):
+            # Remove read-only attribute before writing (Windows). Elsewhere
+            # the attrib calls would only spawn a process that fails.
+            if os.name == "nt" and os.path.exists(self.STORAGE_FILE):
                 try:
                     subprocess.run(
                         ["attrib", "-R", self.STORAGE_FILE],
@@ -1176,19 +1375,28 @@ class PropertyBlockchain:
                 except:
                     pass
 
-            # Save to file
-            with open(self.STORAGE_FILE, "w") as f:
-                f.write(encrypted_data)
+            # Save to a temp file and swap it in, so readers never see a
+            # half-written file. The mtime is recorded before the swap so a
+            # BlockchainHandle never mistakes our own save for a foreign one.
+            # The data is encrypted piece by piece as it is written, so the
+            # encrypted copy of the whole chain is never held in memory.
+            tmp_file = f"{self.STORAGE_FILE}.tmp"
+            with open(tmp_file, "w") as f:
+                f.writelines(self._encrypt_chunks(json_data))
+            if self._writes_canonical_storage():
+                self._storage_mtime_ns = os.stat(tmp_file).st_mtime_ns
+            os.replace(tmp_file, self.STORAGE_FILE)
 
             # Make file read-only on Windows
-            try:
-                subprocess.run(
-                    ["attrib", "+R", self.STORAGE_FILE],
-                    check=False,
-                    capture_output=True,
-                )
-            except:
-                pass  # Silently fail if not on Windows or attrib command not available
+            if os.name == "nt":
+                try:
+                    subprocess.run(
+                        ["attrib", "+R", self.STORAGE_FILE],
+                        check=False,
+                        capture_output=True,
+                    )
+                except:
+                    pass  # Silently fail if attrib command not available
 
             self._log(
                 f"Blockchain saved to read-only encrypted file: {self.STORAGE_FILE}"
@@ -1206,6 +1414,14 @@ class PropertyBlockchain:
             self._log(f"Error saving blockchain: {e}", "error")
             return False
 
+    def _writes_canonical_storage(self) -> bool:
+        """
+        True unless STORAGE_FILE is temporarily pointed elsewhere (save_to_file,
+        load_from_file). BlockchainHandle compares _storage_mtime_ns with the
+        canonical file, so only that file's mtime may be recorded.
+        """
+        return self.STORAGE_FILE == PropertyBlockchain.STORAGE_FILE
+
     def _load_blockchain(self) -> bool:
         """Load blockchain from encrypted JSON file and delete the file after loading."""
         try:
@@ -1216,6 +1432,7 @@ class PropertyBlockchain:
 
             # Read encrypted data - try text mode first, then binary
             encrypted_data = None
+            storage_mtime_ns = os.stat(self.STORAGE_FILE).st_mtime_ns
             try:
                 with open(self.STORAGE_FILE, "r", encoding="utf-8") as f:
                     encrypted_data = f.read()
@@ -1237,7 +1454,7 @@ class PropertyBlockchain:
 
             # Parse JSON
             try:
-                blockchain_data = json.loads(json_data)
+                blockchain_data = _json_loads(json_data)
                 self._log(
                     f"Parsed JSON successfully, found {len(blockchain_data.get('chain', []))} blocks"
                 )
@@ -1249,19 +1466,11 @@ class PropertyBlockchain:
                 return False
 
             # Reconstruct blockchain
-            self.chain = []
-            for block_dict in blockchain_data["chain"]:
-                block = Block(
-                    index=block_dict["index"],
-                    timestamp=block_dict["timestamp"],
-                    data=block_dict["data"],
-                    previous_hash=block_dict["previous_hash"],
-                    property_key=block_dict["property_key"],
-                )
-                # Restore the original hash from storage (don't recalculate)
-                # With deterministic JSON serialization, this should match calculate_hash()
-                block.hash = block_dict["hash"]
-                self.chain.append(block)
+            # Restore the original hashes from storage (don't recalculate here -
+            # is_chain_valid() below hashes every block once)
+            self.chain = [
+                Block.from_dict(block_dict) for block_dict in blockchain_data["chain"]
+            ]
 
             # Restore property index
             self.property_index = blockchain_data["property_index"]
@@ -1274,6 +1483,10 @@ class PropertyBlockchain:
                 "customer_key_to_owner", {}
             )
             self.survey_to_property = blockchain_data.get("survey_to_property", {})
+            self._rebuild_owner_index()
+            self._mark_changed()
+            if self._writes_canonical_storage():
+                self._storage_mtime_ns = storage_mtime_ns
 
             # Validate the loaded blockchain
             if self.is_chain_valid():
@@ -1314,8 +1527,8 @@ class PropertyBlockchain:
             "saved_at": datetime.now().isoformat(),
         }
 
-        # Convert to JSON string
-        json_data = json.dumps(blockchain_data, indent=2)
+        # Convert to compact JSON (see _save_blockchain)
+        json_data = json.dumps(blockchain_data, separators=(",", ":"))
 
         # Encrypt the data
         encrypted_data = self._encrypt_data(json_data)
@@ -1328,21 +1541,13 @@ class PropertyBlockchain:
             json_data = self._decrypt_data(encrypted_data)
 
             # Parse JSON
-            blockchain_data = json.loads(json_data)
+            blockchain_data = _json_loads(json_data)
 
             # Reconstruct blockchain
-            self.chain = []
-            for block_dict in blockchain_data["chain"]:
-                block = Block(
-                    index=block_dict["index"],
-                    timestamp=block_dict["timestamp"],
-                    data=block_dict["data"],
-                    previous_hash=block_dict["previous_hash"],
-                    property_key=block_dict["property_key"],
-                )
-                # Restore the original hash
-                block.hash = block_dict["hash"]
-                self.chain.append(block)
+            # Restore the original hashes (validated once below)
+            self.chain = [
+                Block.from_dict(block_dict) for block_dict in blockchain_data["chain"]
+            ]
 
             # Restore property index
             self.property_index = blockchain_data["property_index"]
@@ -1355,6 +1560,8 @@ class PropertyBlockchain:
                 "customer_key_to_owner", {}
             )
             self.survey_to_property = blockchain_data.get("survey_to_property", {})
+            self._rebuild_owner_index()
+            self._mark_changed()
 
             # Validate the loaded blockchain
             if self.is_chain_valid():
@@ -1379,21 +1586,14 @@ class PropertyBlockchain:
             json_data = self._decrypt_data(encrypted_data)
 
             # Parse JSON
-            blockchain_data = json.loads(json_data)
+            blockchain_data = _json_loads(json_data)
 
             # Try to load blocks one by one, stopping at first invalid block
             valid_blocks = []
             for i, block_dict in enumerate(blockchain_data["chain"]):
                 try:
-                    block = Block(
-                        index=block_dict["index"],
-                        timestamp=block_dict["timestamp"],
-                        data=block_dict["data"],
-                        previous_hash=block_dict["previous_hash"],
-                        property_key=block_dict["property_key"],
-                    )
                     # Restore the original hash
-                    block.hash = block_dict["hash"]
+                    block = Block.from_dict(block_dict)
 
                     # Check if this block is valid by itself
                     if block.hash == block.calculate_hash():
@@ -1466,6 +1666,9 @@ class PropertyBlockchain:
                 self.customer_key_to_owner = {}
                 self.survey_to_property = {}
 
+            self._rebuild_owner_index()
+            self._mark_changed()
+
             # Validate what we have
             if self.is_chain_valid():
                 return True, f"Successfully recovered {len(self.chain)} valid blocks"
@@ -1545,11 +1748,14 @@ class PropertyBlockchain:
         try:
             # Import database models here to avoid circular imports
             from models import BlockchainBackup, db
+            from sqlalchemy.orm import undefer
 
             # Get the most recent backup from database
-            latest_backup = BlockchainBackup.query.order_by(
-                BlockchainBackup.created_at.desc()
-            ).first()
+            latest_backup = (
+                BlockchainBackup.query.options(undefer(BlockchainBackup.backup_data))
+                .order_by(BlockchainBackup.created_at.desc())
+                .first()
+            )
 
             if not latest_backup:
                 self._log("No database backups found for auto-restore", "error")
@@ -1583,15 +1789,33 @@ class PropertyBlockchain:
             self._log(f"Auto-restore failed: {str(e)}", "error")
             return False
 
+    def save_local(self) -> bool:
+        """
+        Save blockchain to the local encrypted file (no database copy).
+        Fast and synchronous - safe to call from request handlers.
+        """
+        return self._save_blockchain()
+
+    def push_ipfs(self) -> Optional[str]:
+        """
+        Upload the saved blockchain file to IPFS if Pinata keys are configured.
+        Slow (network bound) - the Flask app runs this on a background worker.
+
+        Returns:
+            The IPFS CID, or None if skipped or failed
+        """
+        if self.PINATA_API_KEY and self.PINATA_SECRET_KEY:
+            self._log("Triggering immediate IPFS backup...")
+            return self.backup_to_ipfs()
+        return None
+
     def save_and_exit(self) -> None:
         """Save blockchain to encrypted storage before exiting."""
-        self._save_blockchain()
+        self.save_local()
         
         # Automatically backup to IPFS after saving to disk
         # This ensures persistence even if the server crashes or shutdown hook fails
-        if self.PINATA_API_KEY and self.PINATA_SECRET_KEY:
-            self._log("Triggering immediate IPFS backup...")
-            self.backup_to_ipfs()
+        self.push_ipfs()
 
     def save_to_file(self, filename: str = None):
         """
@@ -1658,6 +1882,8 @@ class PropertyBlockchain:
                 )
                 return None
 
+            import requests  # only needed for IPFS, so not imported at startup
+
             headers = {
                 "pinata_api_key": self.PINATA_API_KEY,
                 "pinata_secret_api_key": self.PINATA_SECRET_KEY,
@@ -1748,7 +1974,7 @@ class PropertyBlockchain:
         Args:
             cid: The IPFS Content Identifier from a previous backup
         """
-        import re
+        import requests  # only needed for IPFS, so not imported at startup
 
         try:
             # Ensure storage folder exists
@@ -1960,18 +2186,22 @@ class PropertyBlockchain:
         try:
             from flask import Flask
             from models import db, BlockchainBackup
+            from sqlalchemy.orm import undefer
             
             self._log("Starting database restore...")
             
             # Get backup from database
+            backup_query = BlockchainBackup.query.options(
+                undefer(BlockchainBackup.backup_data)
+            )
             if backup_id:
-                backup = BlockchainBackup.query.get(backup_id)
+                backup = backup_query.get(backup_id)
                 if not backup:
                     self._log(f"Backup ID {backup_id} not found in database!", "error")
                     return False
             else:
                 # Get most recent backup
-                backup = BlockchainBackup.query.order_by(BlockchainBackup.created_at.desc()).first()
+                backup = backup_query.order_by(BlockchainBackup.created_at.desc()).first()
                 if not backup:
                     self._log("No backups found in database!", "error")
                     return False
@@ -2001,7 +2231,7 @@ class PropertyBlockchain:
             if self._load_blockchain():
                 self._log(f"✅ Blockchain restored from database!")
                 self._log(f"   Loaded {len(self.chain)} blocks")
-                self._log(f"   Properties: {len([k for k in self.property_index if k != 'GENESIS'])}")
+                self._log(f"   Properties: {self.get_property_count()}")
                 return True
             else:
                 self._log("Failed to load blockchain after restore", "error")
@@ -2037,3 +2267,55 @@ class PropertyBlockchain:
         except Exception as e:
             self._log(f"Auto-restore from database failed: {str(e)}", "error")
             return False
+
+
+class BlockchainHandle:
+    """
+    Stable reference to the live PropertyBlockchain.
+
+    Attribute access is forwarded to the current instance, so callers keep
+    using `blockchain.add_property(...)` while restores swap the instance
+    with replace(). get() reloads from STORAGE_FILE when its mtime shows that
+    another process wrote it. The server itself runs a single worker (see
+    gunicorn.conf.py); the other writers are the maintenance scripts such as
+    repair_blockchain.py and generate_test_data.py, run while it is up.
+    """
+
+    def __init__(self, blockchain: PropertyBlockchain):
+        object.__setattr__(self, "_current", blockchain)
+        object.__setattr__(self, "_lock", threading.Lock())
+        # File mtime we already reacted to (a failed reload is not retried)
+        object.__setattr__(self, "_seen_mtime_ns", blockchain._storage_mtime_ns)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._current, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._current, name, value)
+
+    def replace(self, blockchain: PropertyBlockchain) -> None:
+        """Make `blockchain` the live instance."""
+        with self._lock:
+            object.__setattr__(self, "_current", blockchain)
+            object.__setattr__(self, "_seen_mtime_ns", blockchain._storage_mtime_ns)
+
+    def get(self) -> PropertyBlockchain:
+        """Return the live instance, reloading it first if the file changed."""
+        current = self._current
+        try:
+            mtime_ns = os.stat(PropertyBlockchain.STORAGE_FILE).st_mtime_ns
+        except OSError:
+            return current
+        if mtime_ns in (current._storage_mtime_ns, self._seen_mtime_ns):
+            return current
+
+        with self._lock:
+            if self._current is not current or self._seen_mtime_ns == mtime_ns:
+                return self._current
+            object.__setattr__(self, "_seen_mtime_ns", mtime_ns)
+            reloaded = PropertyBlockchain.from_storage_file(verbose=current.verbose)
+            if reloaded is None:
+                logger.error("Blockchain file changed but could not be reloaded")
+                return current
+            object.__setattr__(self, "_current", reloaded)
+            return reloaded
@@ -15,10 +15,18 @@ from chatbot_training_data import (
 
 class ChatbotService:
     """Comprehensive chatbot service with training data and fuzzy matching"""
-    def __init__(self, blockchain, gemini_client=None):
+    def __init__(self, blockchain, gemini_client=None, gemini_client_factory=None):
         self.blockchain = blockchain
-        self.gemini_client = gemini_client
+        self._gemini_client = gemini_client
+        self._gemini_client_factory = gemini_client_factory  # Builds the client on first use
         self.response_delay = 5  # 5 second delay before responding
+
+    @property
+    def gemini_client(self):
+        """Gemini client, created through the factory the first time it is needed"""
+        if self._gemini_client is None and self._gemini_client_factory:
+            self._gemini_client = self._gemini_client_factory()
+        return self._gemini_client
         
     def handle_message(self, user_id, message):
         """Handle incoming messages with delay and intent detection"""
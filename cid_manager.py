@@ -10,8 +10,6 @@ import os
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-import requests
-
 
 class CIDManager:
     """
@@ -130,6 +128,8 @@ class CIDManager:
             print("⚠️ Render API credentials not configured")
             return False
 
+        import requests  # only loaded once a remote store is configured
+
         try:
             url = (
                 f"https://api.render.com/v1/services/{self.render_service_id}/env-vars"
@@ -179,6 +179,8 @@ class CIDManager:
         if not (self.pinata_api_key and self.pinata_secret_key):
             return False
 
+        import requests  # only loaded once a remote store is configured
+
         try:
             url = f"https://api.pinata.cloud/pinning/hashMetadata"
             headers = {
@@ -211,6 +213,8 @@ class CIDManager:
         if not (self.pinata_api_key and self.pinata_secret_key):
             return None
 
+        import requests  # only loaded once a remote store is configured
+
         try:
             url = "https://api.pinata.cloud/data/pinList"
             headers = {
@@ -253,6 +257,8 @@ class CIDManager:
         if not (self.github_token and self.gist_id):
             return False
 
+        import requests  # only loaded once a remote store is configured
+
         try:
             url = f"https://api.github.com/gists/{self.gist_id}"
             headers = {
@@ -285,6 +291,8 @@ class CIDManager:
         if not (self.github_token and self.gist_id):
             return None
 
+        import requests  # only loaded once a remote store is configured
+
         try:
             url = f"https://api.github.com/gists/{self.gist_id}"
             headers = {
@@ -397,6 +405,8 @@ class CIDManager:
         if not (self.pinata_api_key and self.pinata_secret_key):
             return False
             
+        import requests  # only loaded once a remote store is configured
+
         try:
             url = f"https://api.pinata.cloud/pinning/unpin/{cid}"
             headers = {
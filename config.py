@@ -19,6 +19,9 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SECURE = False  # Set True in production with HTTPS
     SESSION_COOKIE_SAMESITE = 'Lax'
+    # Optional server-side sessions (needs Flask-Session and redis installed),
+    # e.g. redis://localhost:6379/0 or unix:///var/run/redis/redis.sock
+    SESSION_REDIS_URL = os.environ.get('SESSION_REDIS_URL')
     
     # Database configuration (for authentication only)
     DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///database.db'
@@ -38,6 +41,19 @@ class Config:
         'pool_recycle': 300,    # Recycle connections after 5 minutes
     }
     
+    # Size the PostgreSQL pool so concurrent requests and background backup
+    # jobs don't queue behind the default 5 connections (SQLite keeps its default pool)
+    if SQLALCHEMY_DATABASE_URI.startswith(('postgresql://', 'postgres://')):
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        })
+    
+    # Seconds between user snapshot reloads and last_login flushes. Every
+    # gunicorn worker keeps its own snapshot, so raise this when running
+    # several workers to keep the periodic users-table reads in check
+    AUTH_WORKER_INTERVAL = int(os.environ.get('AUTH_WORKER_INTERVAL', 30))
+    
     # Blockchain persistence file
     BLOCKCHAIN_FILE = 'blockchain_data.pkl'
     
@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for the Property Registration Blockchain System
+Loaded automatically by `gunicorn wsgi:application` from the project root
+"""
+
+import os
+
+# Render provides the port to listen on
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# The blockchain, chat streams and backup job status live in process memory,
+# so every request must reach the same process: one worker, many threads.
+# Extra worker processes would each load their own copy of the chain. (The
+# file-mtime reload in BlockchainHandle is only there to pick up saves made by
+# maintenance scripts, it does not make several workers safe.)
+# Chat streams are short long-polls limited to half of these threads
+# (CHAT_STREAM_MAX_CONCURRENT in app.py), so they cannot starve other requests.
+workers = int(os.environ.get("GUNICORN_WORKERS", 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# IPFS restores and large database backups can take a while
+timeout = 120
+graceful_timeout = 60
+keepalive = 5
@@ -3,12 +3,35 @@ Database models for user authentication
 SQLite is used ONLY for authentication - NOT for blockchain data
 """
 
+import hmac
 from datetime import datetime
 
+import bcrypt
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
 
+# Prefixes of bcrypt hashes - anything else in users.password is a legacy
+# plaintext password, upgraded to a hash on the user's next login
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with bcrypt for storage in users.password"""
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("ascii")
+
+
+def password_needs_rehash(stored: str) -> bool:
+    """True if the stored password is legacy plaintext"""
+    return not stored.startswith(_BCRYPT_PREFIXES)
+
+
+def verify_password(stored: str, password: str) -> bool:
+    """Check a password against its stored bcrypt hash (or legacy plaintext) in constant time"""
+    if password_needs_rehash(stored):
+        return hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+    return bcrypt.checkpw(password.encode("utf-8"), stored.encode("ascii"))
+
 
 class User(db.Model):
     """
@@ -21,7 +44,7 @@ class User(db.Model):
     username = db.Column(
         db.String(80), unique=True, nullable=False, index=True
     )  # This will store the Customer Key
-    password = db.Column(db.String(255), nullable=False)
+    password = db.Column(db.String(255), nullable=False)  # bcrypt hash
     full_name = db.Column(db.String(120), nullable=False)
     aadhar = db.Column(db.String(20), unique=True, nullable=True)
     pan = db.Column(db.String(20), unique=True, nullable=True)
@@ -33,7 +56,12 @@ class User(db.Model):
     is_active = db.Column(db.Boolean, default=True)
 
     properties = db.relationship("Property", backref="owner", lazy=True)
-    appointments = db.relationship("Appointment", backref="user", lazy=True)
+    appointments = db.relationship(
+        "Appointment",
+        backref="user",
+        lazy=True,
+        order_by="Appointment.created_at.desc()",
+    )
     messages = db.relationship("Message", backref="sender", lazy=True)
 
     def update_last_login(self):
@@ -78,7 +106,9 @@ class Property(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     property_key = db.Column(db.String(255), unique=True, nullable=False, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id"), nullable=False, index=True
+    )
     address = db.Column(db.String(255), nullable=False)
     pincode = db.Column(db.String(10), nullable=False)
     value = db.Column(db.Float, nullable=False)
@@ -121,12 +151,24 @@ class Appointment(db.Model):
         return f"<Appointment {self.id} for {self.property_key}>"
 
 
+# The user dashboard lists a user's appointments newest first
+db.Index(
+    "ix_appointments_user_created",
+    Appointment.user_id,
+    Appointment.created_at.desc(),
+)
+
+
 class Message(db.Model):
     """
     Message model for chat between users and officials
     """
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Chat polling filters by appointment and orders by timestamp
+        db.Index("ix_messages_appointment_timestamp", "appointment_id", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     appointment_id = db.Column(
@@ -152,8 +194,12 @@ class BlockchainBackup(db.Model):
     filename = db.Column(
         db.String(255), nullable=False
     )  # Original filename for reference
-    backup_data = db.Column(db.Text, nullable=False)  # Encrypted blockchain data
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Encrypted blockchain data - deferred so listing backups never pulls the
+    # blobs; code that needs them asks explicitly with undefer()/load_only()
+    backup_data = db.deferred(db.Column(db.Text, nullable=False))
+    created_at = db.Column(
+        db.DateTime, default=datetime.utcnow, index=True
+    )  # Backups are always listed/pruned newest first
     created_by = db.Column(
         db.Integer, db.ForeignKey("users.id"), nullable=False
     )  # User who created the backup
@@ -172,6 +218,12 @@ def init_db(app):
         # Create all tables
         db.create_all()
 
+        # create_all() skips indexes on tables that already exist, so add any
+        # index introduced after the table was first created
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+
         # Check if admin exists, if not create default users
         if User.query.count() == 0:
             # Create default admin
@@ -180,7 +232,7 @@ def init_db(app):
                 full_name="System Administrator",
                 role="admin",
                 is_active=True,
-                password="admin123",  # Change in production!
+                password=hash_password("admin123"),  # Change in production!
             )
 
             # Create default officer
@@ -189,7 +241,7 @@ def init_db(app):
                 full_name="Property Officer",
                 role="officer",
                 is_active=True,
-                password="officer123",  # Change in production!
+                password=hash_password("officer123"),  # Change in production!
             )
 
             db.session.add(admin)
@@ -49,7 +49,7 @@ def test_ipfs_auto_restore():
     print("\n" + "="*70)
     print("RESTORATION LOGS (last 10):")
     print("="*70)
-    for log in blockchain.logs[-10:]:
+    for log in blockchain.recent_logs(10):
         print(f"  {log}")
     
     print("\n" + "="*70)
@@ -41,7 +41,7 @@ if len(properties) > 5:
 print("\n" + "-"*70)
 print("RECENT LOGS:")
 print("-"*70)
-for log in blockchain.logs[-15:]:
+for log in blockchain.recent_logs(15):
     print(f"  {log}")
 
 print("\n" + "="*70)
@@ -0,0 +1,261 @@
+"""
+Regression tests for appointment time parsing, blockchain restore ordering
+and the current-owner indexes.
+
+Needs pytest, which is not in requirements.txt:
+    pip install -r requirements.txt -r requirements-dev.txt
+Run with: python -m pytest test_regressions.py
+(python -m unittest cannot run these - they use pytest fixtures)
+The app is imported inside a temporary working directory with its own SQLite
+database, so the real blocks/ folder and database are never touched.
+"""
+
+import atexit
+import importlib
+import os
+import sys
+
+import pytest
+
+from blockchain import PropertyBlockchain
+
+
+# ==================== HELPERS ====================
+
+def _add_property(blockchain, i, owner=None):
+    """Add property P<i> owned by 'Owner <i>' (or `owner`) with matching identity numbers."""
+    return blockchain.add_property(
+        property_key=f"P{i}",
+        owner=owner or f"Owner {i}",
+        address=f"{i} Main Road",
+        pincode="560001",
+        value=1000.0 + i,
+        aadhar_no="%012d" % (100000000000 + i),
+        pan_no="ABCDE%04dF" % i,
+        survey_no=f"S-{i}",
+        village="Vill",
+        taluk="Tal",
+        district="Dist",
+        state="KA",
+        land_area="1 acre",
+        land_type="agri",
+    )
+
+
+def _owner_indexes(blockchain):
+    """Snapshot both owner indexes, ignoring empty buckets and list order."""
+    return (
+        {key: sorted(keys) for key, keys in blockchain._by_owner.items() if keys},
+        {key: sorted(keys) for key, keys in blockchain._by_owner_name.items() if keys},
+    )
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    """Import app.py inside a scratch directory with a throwaway database."""
+    workdir = tmp_path_factory.mktemp("pawperties")
+    old_cwd = os.getcwd()
+    old_env = {name: os.environ.get(name) for name in ("DATABASE_URL", "PINATA_API_KEY", "PINATA_SECRET_KEY")}
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'test.db'}"
+    os.environ.pop("PINATA_API_KEY", None)
+    os.environ.pop("PINATA_SECRET_KEY", None)
+    os.chdir(workdir)
+    try:
+        import config
+        importlib.reload(config)
+        import app as app_module
+        app_module.app.config["TESTING"] = True
+        yield app_module
+    finally:
+        # The shutdown backup would otherwise run after we leave the scratch directory
+        if "app" in sys.modules:
+            atexit.unregister(sys.modules["app"].auto_backup_on_shutdown)
+        os.chdir(old_cwd)
+        for name, value in old_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@pytest.fixture(scope="module")
+def admin_client(app_module):
+    client = app_module.app.test_client()
+    response = client.post("/login", data={"username": "admin", "password": "admin123"})
+    assert response.status_code == 302
+    return client
+
+
+@pytest.fixture(scope="module")
+def owner_client(app_module, admin_client):
+    """A registered user who owns property P1."""
+    response = admin_client.post("/property/add", data=dict(
+        property_key="P1", owner="Owner 1", address="1 Main Road", pincode="560001",
+        value="1000", aadhar_no="1000 0000 0001", pan_no="ABCDE0001F", survey_no="S-1",
+        rtc_no="R", village="Vill", taluk="Tal", district="Dist", state="KA",
+        land_area="1 acre", land_type="agri",
+    ))
+    assert response.status_code == 302
+
+    customer_key = app_module.blockchain.get_property_current_state("P1")["customer_key"]
+    client = app_module.app.test_client()
+    response = client.post("/register", data=dict(
+        full_name="Owner 1", customer_key=customer_key, pan="ABCDE0001F",
+        aadhar="100000000001", password="pw",
+    ))
+    assert response.status_code == 302
+    response = client.post("/login", data={"username": customer_key, "password": "pw"})
+    assert response.status_code == 302
+    return client
+
+
+# ==================== APPOINTMENT TIME PARSING ====================
+
+def _schedule(client, preferred_time):
+    return client.post("/appointment/schedule/P1/transfer", data=dict(
+        full_name="Owner 1", phone_number="9999999999", email="owner@example.com",
+        preferred_date="2030-01-02", preferred_time=preferred_time, notes="",
+    ))
+
+
+@pytest.mark.parametrize("preferred_time", ["10:00+05:30", "10:00Z", "25:00", "soon"])
+def test_schedule_appointment_rejects_bad_times(app_module, owner_client, preferred_time):
+    with app_module.app.app_context():
+        before = app_module.Appointment.query.count()
+
+    response = _schedule(owner_client, preferred_time)
+
+    # The form is shown again with a flash instead of a 500
+    assert response.status_code == 200
+    with app_module.app.app_context():
+        assert app_module.Appointment.query.count() == before
+
+
+@pytest.mark.parametrize("preferred_time", ["10:00", "10:00:30"])
+def test_schedule_appointment_accepts_naive_times(app_module, owner_client, preferred_time):
+    with app_module.app.app_context():
+        before = app_module.Appointment.query.count()
+
+    response = _schedule(owner_client, preferred_time)
+
+    assert response.status_code == 302
+    with app_module.app.app_context():
+        assert app_module.Appointment.query.count() == before + 1
+
+
+# ==================== RESTORE ORDERING ====================
+
+def _store_backup(app_module, name):
+    """Save the live chain as a database backup and return its restore id."""
+    with app_module.app.app_context():
+        backup = app_module.BlockchainBackup(
+            name=name,
+            filename=f"{name}.encrypted",
+            backup_data=app_module.blockchain.get_encrypted_data(),
+            created_by=1,
+        )
+        app_module.db.session.add(backup)
+        app_module.db.session.commit()
+        return f"db_backup_{backup.id}"
+
+
+def _backup_names(app_module):
+    with app_module.app.app_context():
+        return [name for (name,) in app_module.db.session.query(app_module.BlockchainBackup.name)]
+
+
+def test_restore_keeps_live_chain_when_snapshot_commit_fails(app_module, admin_client, monkeypatch):
+    backup_id = _store_backup(app_module, "before-P2")
+    _add_property(app_module.blockchain, 2)
+
+    live = app_module.blockchain.get()
+    live_length = len(live.chain)
+    with open(PropertyBlockchain.STORAGE_FILE, "rb") as f:
+        stored = f.read()
+    names_before = _backup_names(app_module)
+
+    def failing_commit():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(app_module.db.session, "commit", failing_commit)
+    response = admin_client.post("/admin/blockchain/restore", data={"backup_file": backup_id})
+    monkeypatch.undo()
+
+    assert response.status_code == 302
+    # Nothing was swapped or rewritten, and no snapshot was left behind
+    assert app_module.blockchain.get() is live
+    assert len(app_module.blockchain.chain) == live_length
+    with open(PropertyBlockchain.STORAGE_FILE, "rb") as f:
+        assert f.read() == stored
+    assert _backup_names(app_module) == names_before
+
+
+def test_restore_commits_snapshot_then_swaps_chain(app_module, admin_client):
+    backup_id = _store_backup(app_module, "restore-target")
+    restored_length = len(app_module.blockchain.chain)
+    _add_property(app_module.blockchain, 3)
+    live = app_module.blockchain.get()
+
+    response = admin_client.post("/admin/blockchain/restore", data={"backup_file": backup_id})
+
+    assert response.status_code == 302
+    assert app_module.blockchain.get() is not live
+    assert len(app_module.blockchain.chain) == restored_length
+    assert any(name.startswith("Pre-restore backup") for name in _backup_names(app_module))
+
+
+def test_restore_of_corrupt_backup_writes_nothing(app_module, admin_client):
+    with app_module.app.app_context():
+        backup = app_module.BlockchainBackup(
+            name="corrupt", filename="corrupt.encrypted", backup_data="not a backup", created_by=1
+        )
+        app_module.db.session.add(backup)
+        app_module.db.session.commit()
+        backup_id = f"db_backup_{backup.id}"
+    live = app_module.blockchain.get()
+    names_before = _backup_names(app_module)
+
+    response = admin_client.post("/admin/blockchain/restore", data={"backup_file": backup_id})
+
+    assert response.status_code == 302
+    assert app_module.blockchain.get() is live
+    assert _backup_names(app_module) == names_before
+
+
+# ==================== OWNER INDEX CONSISTENCY ====================
+
+def test_owner_indexes_match_full_rebuild_after_transfer_and_inherit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    blockchain = PropertyBlockchain(verbose=False, load_existing=False)
+    for i in range(4):
+        _add_property(blockchain, i)
+    # Same name as P0's owner in a different case - both live under one name key
+    _add_property(blockchain, 4, owner="OWNER 0")
+
+    blockchain.transfer_property("P1", "Owner 2", "%012d" % 100000000002, "ABCDE0002F")
+    blockchain.transfer_property("P2", "New Buyer", "%012d" % 100000000009, "ABCDE0009F")
+    blockchain.inherit_property(
+        "P3", "owner 3", "Heir Three", "%012d" % 100000000008, "ABCDE0008F", relationship="son"
+    )
+    blockchain.transfer_property("P4", "Owner 2", "%012d" % 100000000002, "ABCDE0002F")
+
+    incremental = _owner_indexes(blockchain)
+    blockchain._rebuild_owner_index()
+    assert incremental == _owner_indexes(blockchain)
+
+    assert sorted(p["property_key"] for p in blockchain.search_by_owner("owner 2")) == ["P1", "P4"]
+    assert [p["property_key"] for p in blockchain.search_by_owner("heir three")] == ["P3"]
+    assert blockchain.search_by_owner("Owner 3") == []
+
+
+def test_transfer_to_same_owner_is_rejected_case_insensitively(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    blockchain = PropertyBlockchain(verbose=False, load_existing=False)
+    _add_property(blockchain, 0)
+
+    with pytest.raises(ValueError):
+        blockchain.transfer_property("P0", "  OWNER 0 ", "%012d" % 100000000000, "ABCDE0000F")
+    with pytest.raises(ValueError):
+        blockchain.inherit_property(
+            "P0", "Someone Else", "Heir", "%012d" % 100000000008, "ABCDE0008F"
+        )
@@ -0,0 +1,8 @@
+"""
+WSGI entry point for production servers
+Run with: gunicorn wsgi:application (settings come from gunicorn.conf.py)
+"""
+
+from app import app as application
+
+app = application